@@ -1,6 +1,7 @@
 from django.contrib import admin
 
 from .models import Category, Location, Post
+from .search import search_posts
 
 
 @admin.register(Post)
@@ -24,6 +25,11 @@ class PostAdmin(admin.ModelAdmin):
     list_filter = ('category',)
     list_display_links = ('title',)
 
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term:
+            return queryset, False
+        return search_posts(queryset, search_term), False
+
 
 @admin.register(Category)
 class CategoryAdmin(admin.ModelAdmin):
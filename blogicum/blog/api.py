@@ -0,0 +1,256 @@
+from http import HTTPStatus
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db.models import Case, CharField, F, Value, When
+from django.db.models.functions import Concat
+from django.http import Http404, JsonResponse
+from django.views import View
+
+from .constants import API_LIMIT_ON_PAGE, API_MAX_LIMIT
+from .models import Category, Comment, Post
+from .paginators import CursorPaginator, InvalidCursor
+
+POST_COLUMNS = {
+    'id': 'id',
+    'title': 'title',
+    'text': 'text',
+    'pub_date': 'pub_date',
+    'updated_at': 'updated_at',
+    'author': 'author__username',
+    'category': 'category__slug',
+    'location': Case(
+        When(location__is_published=True, then=F('location__name'))
+    ),
+    'image': Case(
+        When(image='', then=None),
+        default=Concat(Value(settings.MEDIA_URL), 'image'),
+        output_field=CharField(),
+    ),
+    'comment_count': 'comment_count',
+}
+
+COMMENT_COLUMNS = {
+    'id': 'id',
+    'post': 'post_id',
+    'parent': 'parent_id',
+    'author': 'author__username',
+    'created_at': 'created_at',
+    'text': 'text',
+}
+
+CATEGORY_COLUMNS = {
+    'id': 'id',
+    'slug': 'slug',
+    'title': 'title',
+    'description': 'description',
+}
+
+PROFILE_COLUMNS = {
+    'id': 'id',
+    'username': 'username',
+    'first_name': 'first_name',
+    'last_name': 'last_name',
+    'date_joined': 'date_joined',
+}
+
+
+class ApiError(ValueError):
+    """Неверные параметры запроса, клиент получает 400."""
+
+
+def column_key(name, column):
+    """Ключ столбца в строке values(): путь в ORM или имя выражения."""
+    return column if isinstance(column, str) else f'api_{name}'
+
+
+class ApiView(View):
+    """Основа видов JSON API: только чтение, строки из values().
+
+    columns сопоставляет имя поля в ответе с путём в ORM или
+    выражением. ?fields=a,b выбирает из базы только эти столбцы,
+    а объекты моделей не создаются вовсе.
+    """
+
+    http_method_names = ['get', 'head', 'options']
+    columns = {}
+    default_fields = None
+    key_fields = ()
+
+    def get_queryset(self):
+        raise NotImplementedError
+
+    def get_data(self, fields):
+        raise NotImplementedError
+
+    def get_fields(self):
+        fields = self.request.GET.get('fields')
+        if fields is None:
+            return list(self.default_fields or self.columns)
+        names = list(dict.fromkeys(
+            name.strip() for name in fields.split(',') if name.strip()
+        ))
+        unknown = [name for name in names if name not in self.columns]
+        if unknown or not names:
+            raise ApiError(
+                f'Неизвестные поля: {", ".join(unknown) or "—"}. '
+                f'Доступны: {", ".join(self.columns)}.'
+            )
+        return names
+
+    def select(self, queryset, fields):
+        """values() с полями ответа и ключевыми полями key_fields."""
+        lookups = dict.fromkeys(self.key_fields)
+        expressions = {}
+        for name in fields:
+            column = self.columns[name]
+            if isinstance(column, str):
+                lookups[column] = None
+            else:
+                expressions[column_key(name, column)] = column
+        return queryset.values(*lookups, **expressions)
+
+    def serialize(self, row, fields):
+        return {
+            name: row[column_key(name, self.columns[name])]
+            for name in fields
+        }
+
+    def get(self, request, *args, **kwargs):
+        try:
+            data = self.get_data(self.get_fields())
+        except ApiError as error:
+            data, status = {'error': str(error)}, HTTPStatus.BAD_REQUEST
+        except Http404:
+            data, status = {'error': 'Не найдено.'}, HTTPStatus.NOT_FOUND
+        else:
+            status = HTTPStatus.OK
+        return JsonResponse(
+            data, status=status, json_dumps_params={'ensure_ascii': False}
+        )
+
+
+class ApiListView(ApiView):
+    """Список с курсорной пагинацией по ordering.
+
+    Ответ: results, а также ссылки next и previous или null.
+    """
+
+    ordering = ('-id',)
+
+    @property
+    def key_fields(self):
+        return [name.lstrip('-') for name in self.ordering]
+
+    def get_limit(self):
+        limit = self.request.GET.get('limit', API_LIMIT_ON_PAGE)
+        try:
+            return min(max(int(limit), 1), API_MAX_LIMIT)
+        except ValueError:
+            raise ApiError('limit должен быть целым числом.')
+
+    def page_url(self, cursor):
+        if cursor is None:
+            return None
+        query = self.request.GET.copy()
+        query['cursor'] = cursor
+        return self.request.build_absolute_uri(f'?{query.urlencode()}')
+
+    def get_data(self, fields):
+        paginator = CursorPaginator(
+            self.select(self.get_queryset(), fields),
+            self.get_limit(),
+            ordering=self.ordering,
+        )
+        try:
+            page = paginator.page(self.request.GET.get('cursor'))
+        except InvalidCursor:
+            raise ApiError('Некорректный курсор.')
+        return {
+            'results': [self.serialize(row, fields) for row in page],
+            'next': self.page_url(page.next_cursor),
+            'previous': self.page_url(page.previous_cursor),
+        }
+
+
+class ApiDetailView(ApiView):
+    """Один объект из get_queryset() или 404."""
+
+    def get_data(self, fields):
+        row = self.select(self.get_queryset(), fields).first()
+        if row is None:
+            raise Http404
+        return self.serialize(row, fields)
+
+
+class PostListApiView(ApiListView):
+    """Опубликованные посты, новые первыми.
+
+    Фильтры: ?category=<slug> и ?author=<username>.
+    """
+
+    query_budget = 3
+    columns = POST_COLUMNS
+    default_fields = [name for name in POST_COLUMNS if name != 'text']
+    ordering = ('-pub_date', '-id')
+
+    def get_queryset(self):
+        queryset = Post.objects.published()
+        if category := self.request.GET.get('category'):
+            queryset = queryset.filter(category__slug=category)
+        if author := self.request.GET.get('author'):
+            queryset = queryset.filter(author__username=author)
+        return queryset
+
+
+class PostApiView(ApiDetailView):
+    """Пост, видимый текущему пользователю."""
+
+    query_budget = 3
+    columns = POST_COLUMNS
+
+    def get_queryset(self):
+        return Post.objects.visible_to(self.request.user).filter(
+            pk=self.kwargs['post_id']
+        )
+
+
+class CommentListApiView(ApiListView):
+    """Комментарии поста в порядке обхода веток."""
+
+    query_budget = 4
+    columns = COMMENT_COLUMNS
+    ordering = ('path',)
+
+    def get_queryset(self):
+        if not Post.objects.visible_to(self.request.user).filter(
+            pk=self.kwargs['post_id']
+        ).exists():
+            raise Http404
+        return Comment.objects.filter(post_id=self.kwargs['post_id'])
+
+
+class CategoryListApiView(ApiListView):
+    """Опубликованные категории по порядку создания."""
+
+    query_budget = 3
+    columns = CATEGORY_COLUMNS
+    ordering = ('id',)
+
+    def get_queryset(self):
+        return Category.objects.filter(is_published=True)
+
+
+class ProfileApiView(ApiDetailView):
+    """Открытые поля профиля активного пользователя.
+
+    Посты пользователя — /api/posts/?author=<username>.
+    """
+
+    query_budget = 3
+    columns = PROFILE_COLUMNS
+
+    def get_queryset(self):
+        return User.objects.filter(
+            username=self.kwargs['username'], is_active=True
+        )
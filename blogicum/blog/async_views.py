@@ -0,0 +1,161 @@
+from http import HTTPStatus
+
+from django.contrib.auth.models import User
+from django.shortcuts import aget_object_or_404
+from django.template.response import TemplateResponse
+from django.views import View
+
+from .cache import FEED_TAG, aget_cached_page, aset_cached_page
+from .constants import POST_LIMIT_ON_PAGE
+from .forms import CommentForm
+from .models import Category, Post
+from .paginators import CachedCountPaginator, CursorPaginator
+from .utils import comment_paginator
+
+
+class AsyncPageView(View):
+    """Базовый асинхронный вид для запуска под ASGI.
+
+    Выводит те же шаблоны, что и виды из views.py, но запросы к базе
+    идут через async ORM, и запрос не уходит в поток sync_to_async.
+    Наследники реализуют корутину get_context_data().
+    """
+
+    template_name = None
+
+    async def get_context_data(self, **kwargs):
+        raise NotImplementedError
+
+    def get_page_cache_tags(self):
+        return []
+
+    async def get(self, request, *args, **kwargs):
+        request.user = await request.auser()
+        anonymous = not request.user.is_authenticated
+        if anonymous:
+            response = await aget_cached_page(request)
+            if response is not None:
+                return response
+        context = await self.get_context_data(**kwargs)
+        response = TemplateResponse(request, self.template_name, context)
+        response.render()
+        if anonymous and response.status_code == HTTPStatus.OK:
+            await aset_cached_page(
+                request, response, self.get_page_cache_tags()
+            )
+        return response
+
+
+class AsyncPostListView(AsyncPageView):
+    """Лента с курсорной пагинацией, как у CursorPaginationMixin."""
+
+    cursor_ordering = ('-pub_date', '-id')
+
+    def get_queryset(self):
+        raise NotImplementedError
+
+    async def paginate(self, queryset):
+        if 'page' in self.request.GET:
+            paginator = CachedCountPaginator(queryset, POST_LIMIT_ON_PAGE)
+            page = await paginator.aget_page(self.request.GET['page'])
+        else:
+            paginator = CursorPaginator(
+                queryset, POST_LIMIT_ON_PAGE, ordering=self.cursor_ordering
+            )
+            page = await paginator.aget_page(self.request.GET.get('cursor'))
+        return {
+            'paginator': paginator,
+            'page_obj': page,
+            'is_paginated': page.has_other_pages(),
+            'post_list': page.object_list,
+        }
+
+    async def get_context_data(self, **kwargs):
+        return await self.paginate(self.get_queryset())
+
+
+class AsyncHomePageView(AsyncPostListView):
+    """Главная страница с лентой постов."""
+
+    query_budget = 3
+    template_name = 'blog/index.html'
+
+    def get_queryset(self):
+        return Post.objects.published().for_feed()
+
+    def get_page_cache_tags(self):
+        return [FEED_TAG]
+
+
+class AsyncCategoryPostsView(AsyncPostListView):
+    """Страница с постами категории."""
+
+    query_budget = 4
+    template_name = 'blog/category.html'
+
+    async def get_context_data(self, **kwargs):
+        self.category = await aget_object_or_404(
+            Category, slug=kwargs['category_slug'], is_published=True
+        )
+        context = await self.paginate(
+            Post.objects.published().filter(
+                category=self.category
+            ).for_feed()
+        )
+        context['category'] = self.category
+        return context
+
+    def get_page_cache_tags(self):
+        return [f'category:{self.category.pk}']
+
+
+class AsyncProfileView(AsyncPageView):
+    """Страница профиля пользователя с его постами."""
+
+    query_budget = 5
+    template_name = 'blog/profile.html'
+
+    async def get_context_data(self, **kwargs):
+        self.profile = await aget_object_or_404(
+            User, username=kwargs['username'], is_active=True
+        )
+        posts = Post.objects.visible_to(self.request.user).filter(
+            author=self.profile
+        ).order_by('-pub_date', '-id').for_feed()
+        paginator = CachedCountPaginator(posts, POST_LIMIT_ON_PAGE)
+        return {
+            'profile': self.profile,
+            'page_obj': await paginator.aget_page(
+                self.request.GET.get('page')
+            ),
+            'can_edit': self.request.user == self.profile,
+        }
+
+    def get_page_cache_tags(self):
+        return [f'user:{self.profile.pk}']
+
+
+class AsyncPostDetailView(AsyncPageView):
+    """Страница поста с первой порцией комментариев."""
+
+    query_budget = 4
+    template_name = 'blog/detail.html'
+
+    async def get_context_data(self, **kwargs):
+        user = self.request.user
+        self.object = await aget_object_or_404(
+            Post.objects.visible_to(user).for_feed(), pk=kwargs['post_id']
+        )
+        context = {
+            'post': self.object,
+            'object': self.object,
+            'comments': await comment_paginator(self.object).aget_page(
+                self.request.GET.get('cursor')
+            ),
+        }
+        if user.is_authenticated:
+            context['form'] = CommentForm()
+        return context
+
+    def get_page_cache_tags(self):
+        return [f'post:{self.object.pk}']
@@ -0,0 +1,217 @@
+import hashlib
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.template.loader import render_to_string
+
+from .paginators import invalidate_counts
+
+POST_CARD_TEMPLATE = 'includes/post_card.html'
+
+SITE_TAG = 'site'
+FEED_TAG = 'feed'
+PAGE_CACHE_HITS = 'page-cache:hits'
+PAGE_CACHE_MISSES = 'page-cache:misses'
+CACHED_HEADERS = ('Content-Type', 'ETag', 'Last-Modified')
+
+
+def post_card_key(post_id):
+    return f'post-card:{post_id}'
+
+
+def post_card_version(post):
+    """Версия карточки: всё, что в ней выводится и не зависит от зрителя.
+
+    Связанные объекты уже загружены через for_feed(), поэтому
+    вычисление версии не делает запросов.
+    """
+    category, location = post.category, post.location
+    parts = (
+        post.updated_at.isoformat(),
+        post.comment_count,
+        post.author.username,
+        category and (category.slug, category.title, category.is_published),
+        location and (location.name, location.is_published),
+    )
+    return hashlib.md5(
+        repr(parts).encode(), usedforsecurity=False
+    ).hexdigest()
+
+
+def render_post_cards(posts):
+    """HTML карточек: одно чтение из кэша на всю страницу."""
+    cached = cache.get_many([post_card_key(post.pk) for post in posts])
+    cards, missing = [], {}
+    for post in posts:
+        key, version = post_card_key(post.pk), post_card_version(post)
+        stored_version, html = cached.get(key, (None, None))
+        if stored_version != version:
+            html = render_to_string(POST_CARD_TEMPLATE, {'post': post})
+            missing[key] = (version, html)
+        cards.append(html)
+    if missing:
+        cache.set_many(missing, settings.POST_CARD_CACHE_TTL)
+    return cards
+
+
+def invalidate_post_card(post_id):
+    cache.delete(post_card_key(post_id))
+
+
+def post_tags(post):
+    """Теги страниц, которые показывают публикацию."""
+    return [
+        FEED_TAG,
+        f'post:{post.pk}',
+        f'category:{post.category_id}',
+        f'user:{post.author_id}',
+    ]
+
+
+def _tag_key(tag):
+    return f'page-tag:{tag}'
+
+
+def _page_key(request):
+    path = hashlib.md5(
+        request.get_full_path().encode(), usedforsecurity=False
+    ).hexdigest()
+    return f'page:{path}'
+
+
+def _count(key):
+    if not cache.add(key, 1, timeout=None):
+        cache.incr(key)
+
+
+def invalidate_tags(*tags):
+    """Сбрасывает страницы с любым из тегов, выдавая тегу новую версию."""
+    cache.set_many(
+        {_tag_key(tag): uuid.uuid4().hex for tag in tags}, timeout=None
+    )
+
+
+def tag_version(tag):
+    return cache.get_or_set(_tag_key(tag), uuid.uuid4().hex, timeout=None)
+
+
+def _cached_response(entry, current):
+    """Ответ из записи кэша, если версии всех её тегов не менялись."""
+    versions, status, headers, content = entry
+    if any(
+        current.get(_tag_key(tag)) != version
+        for tag, version in versions.items()
+    ):
+        return None
+    response = HttpResponse(content, status=status, headers=headers)
+    response['X-Page-Cache'] = 'HIT'
+    return response
+
+
+def _new_versions(tags, versions):
+    """Новые версии для тегов, у которых версии в кэше ещё нет.
+
+    Кладутся через add: если версию успел выдать параллельный
+    запрос, берётся она.
+    """
+    return {
+        _tag_key(tag): uuid.uuid4().hex
+        for tag in tags if _tag_key(tag) not in versions
+    }
+
+
+def _tag_versions(tags, versions):
+    return {tag: versions[_tag_key(tag)] for tag in tags}
+
+
+def _page_entry(response, versions):
+    return (
+        versions,
+        response.status_code,
+        {
+            header: response[header]
+            for header in CACHED_HEADERS if response.has_header(header)
+        },
+        response.content,
+    )
+
+
+def get_cached_page(request):
+    entry = cache.get(_page_key(request))
+    if entry is not None:
+        response = _cached_response(
+            entry, cache.get_many([_tag_key(tag) for tag in entry[0]])
+        )
+        if response is not None:
+            _count(PAGE_CACHE_HITS)
+            return response
+    _count(PAGE_CACHE_MISSES)
+    return None
+
+
+def set_cached_page(request, response, tags):
+    """Кладёт отрендеренный ответ в кэш вместе с версиями его тегов."""
+    tags = [SITE_TAG, *tags]
+    versions = cache.get_many([_tag_key(tag) for tag in tags])
+    for key, version in _new_versions(tags, versions).items():
+        if not cache.add(key, version, timeout=None):
+            version = cache.get(key)
+        versions[key] = version
+    cache.set(
+        _page_key(request),
+        _page_entry(response, _tag_versions(tags, versions)),
+        settings.PAGE_CACHE_TTL,
+    )
+    response['X-Page-Cache'] = 'MISS'
+
+
+async def _acount(key):
+    if not await cache.aadd(key, 1, timeout=None):
+        await cache.aincr(key)
+
+
+async def aget_cached_page(request):
+    """get_cached_page для async-видов: кэш не блокирует цикл событий."""
+    entry = await cache.aget(_page_key(request))
+    if entry is not None:
+        response = _cached_response(
+            entry, await cache.aget_many([_tag_key(tag) for tag in entry[0]])
+        )
+        if response is not None:
+            await _acount(PAGE_CACHE_HITS)
+            return response
+    await _acount(PAGE_CACHE_MISSES)
+    return None
+
+
+async def aset_cached_page(request, response, tags):
+    """set_cached_page для async-видов."""
+    tags = [SITE_TAG, *tags]
+    versions = await cache.aget_many([_tag_key(tag) for tag in tags])
+    for key, version in _new_versions(tags, versions).items():
+        if not await cache.aadd(key, version, timeout=None):
+            version = await cache.aget(key)
+        versions[key] = version
+    await cache.aset(
+        _page_key(request),
+        _page_entry(response, _tag_versions(tags, versions)),
+        settings.PAGE_CACHE_TTL,
+    )
+    response['X-Page-Cache'] = 'MISS'
+
+
+def invalidate_post(post, *extra_tags):
+    """Сбрасывает всё закэшированное, что показывает публикацию."""
+    invalidate_counts()
+    invalidate_post_card(post.pk)
+    invalidate_tags(*post_tags(post), *extra_tags)
+
+
+def page_cache_stats():
+    stats = cache.get_many([PAGE_CACHE_HITS, PAGE_CACHE_MISSES])
+    return {
+        'hits': stats.get(PAGE_CACHE_HITS, 0),
+        'misses': stats.get(PAGE_CACHE_MISSES, 0),
+    }
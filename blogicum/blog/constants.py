@@ -4,3 +4,41 @@ MAX_LENGTH = 256
 
 """Количество постов на странице."""
 POST_LIMIT_ON_PAGE = 10
+
+
+"""Ширины миниатюр изображений постов, в пикселях."""
+THUMBNAIL_WIDTHS = (320, 640, 1280)
+
+
+"""Каталог миниатюр рядом с posts_images/."""
+THUMBNAIL_DIR = 'posts_thumbnails'
+
+
+"""Ширина карточки поста (40rem) и атрибут sizes для её изображения."""
+CARD_IMAGE_WIDTH = 640
+CARD_IMAGE_SIZES = '(max-width: 40rem) 100vw, 40rem'
+
+
+"""Количество комментариев в одной порции на странице поста."""
+COMMENT_LIMIT_ON_PAGE = 20
+
+
+"""Ширина одного звена пути комментария: его id с ведущими нулями."""
+COMMENT_PATH_STEP = 10
+
+
+"""Наибольшая глубина ответов; ответ глубже встаёт рядом с родителем."""
+COMMENT_MAX_DEPTH = 8
+
+
+"""Строк, читаемых из базы за раз при выгрузке."""
+EXPORT_CHUNK_SIZE = 2000
+
+
+"""Количество публикаций в RSS и Atom лентах."""
+FEED_LIMIT = 20
+
+
+"""Строк на странице JSON API по умолчанию и наибольшее через ?limit=."""
+API_LIMIT_ON_PAGE = 20
+API_MAX_LIMIT = 100
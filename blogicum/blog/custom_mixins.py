@@ -1,5 +1,17 @@
+import hashlib
+from http import HTTPStatus
+
+from django.conf import settings
 from django.contrib.auth.mixins import UserPassesTestMixin
+from django.http import Http404
 from django.shortcuts import redirect
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_http_date_safe, quote_etag
+
+from core.routers import prefers_primary, read_from_replica
+
+from .cache import SITE_TAG, get_cached_page, set_cached_page, tag_version
+from .paginators import CachedCountPaginator, CursorPaginator
 
 
 class CustomAuthorMixin(UserPassesTestMixin):
@@ -14,3 +26,188 @@ class CustomAuthorMixin(UserPassesTestMixin):
     def handle_no_permission(self):
         obj = self.get_object()
         return redirect('blog:post_detail', post_id=obj.pk)
+
+
+class CursorPaginationMixin:
+    """Миксин курсорной пагинации для ListView.
+
+    Ссылки вида ?page=N продолжают работать через CachedCountPaginator.
+    """
+
+    paginator_class = CachedCountPaginator
+    cursor_ordering = ('-pub_date', '-id')
+    cursor_kwarg = 'cursor'
+
+    def paginate_queryset(self, queryset, page_size):
+        if self.page_kwarg in self.request.GET:
+            return super().paginate_queryset(queryset, page_size)
+        paginator = CursorPaginator(
+            queryset, page_size, ordering=self.cursor_ordering
+        )
+        page = paginator.get_page(self.request.GET.get(self.cursor_kwarg))
+        return paginator, page, page.object_list, page.has_other_pages()
+
+
+class AnonymousPageCacheMixin:
+    """Миксин кэширования страницы целиком для анонимных посетителей.
+
+    Страница сбрасывается, когда меняется версия любого из тегов,
+    которые возвращает get_page_cache_tags(). ETag и Last-Modified
+    хранятся вместе со страницей, поэтому на условный запрос
+    попадание в кэш отвечает 304 без обращения к базе.
+    """
+
+    def get_page_cache_tags(self):
+        return []
+
+    def caches_request(self, request):
+        return request.method == 'GET' and not request.user.is_authenticated
+
+    def dispatch(self, request, *args, **kwargs):
+        if not self.caches_request(request):
+            return super().dispatch(request, *args, **kwargs)
+        response = get_cached_page(request)
+        if response is not None:
+            return get_conditional_response(
+                request,
+                etag=response.get('ETag'),
+                last_modified=parse_http_date_safe(
+                    response.get('Last-Modified', '')
+                ),
+                response=response,
+            )
+        response = super().dispatch(request, *args, **kwargs)
+        if response.status_code == HTTPStatus.OK:
+            response.render()
+            set_cached_page(request, response, self.get_page_cache_tags())
+        return response
+
+
+class ConditionalGetMixin:
+    """Миксин условного GET: ETag и Last-Modified без рендера шаблона.
+
+    get_validators() лёгким запросом возвращает список значений,
+    от которых зависит страница, и время последнего изменения. Он
+    выполняется, только если клиент прислал If-None-Match или
+    If-Modified-Since; при совпадении отвечаем 304. Обычному запросу
+    те же валидаторы считает context_validators() по контексту
+    собранной страницы, без лишних запросов.
+    """
+
+    validator_fields = ('pk', 'pub_date', 'updated_at', 'comment_count')
+
+    def get_validators(self):
+        raise NotImplementedError
+
+    def context_validators(self, context):
+        return self.page_validators(context['page_obj'])
+
+    def page_validators(self, page):
+        posts = [
+            (post.pk, post.updated_at, post.comment_count) for post in page
+        ]
+        return (
+            [posts, page.has_next(), page.has_previous()],
+            max((post.updated_at for post in page), default=None),
+        )
+
+    def get_page_cache_tags(self):
+        return []
+
+    def validator_headers(self, parts, last_modified):
+        """Заголовки: ETag зависит от зрителя, тегов страницы и parts.
+
+        Теги меняются и тогда, когда валидаторы их не видят:
+        например, при смене имени пользователя без публикаций.
+        """
+        versions = [
+            tag_version(tag)
+            for tag in (SITE_TAG, *self.get_page_cache_tags())
+        ]
+        etag = quote_etag(hashlib.md5(repr((
+            self.request.user.pk, versions, parts
+        )).encode(), usedforsecurity=False).hexdigest())
+        return etag, last_modified and int(last_modified.timestamp())
+
+    def not_modified(self, request):
+        """Ответ 304 или None, если страницу нужно собрать."""
+        try:
+            etag, last_modified = self.validator_headers(
+                *self.get_validators()
+            )
+        except Http404:
+            return None
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if response is not None:
+            response['ETag'] = etag
+            if last_modified:
+                response['Last-Modified'] = http_date(last_modified)
+        return response
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD'):
+            return super().dispatch(request, *args, **kwargs)
+        conditional = (
+            'HTTP_IF_NONE_MATCH' in request.META
+            or 'HTTP_IF_MODIFIED_SINCE' in request.META
+        )
+        response = conditional and self.not_modified(request)
+        if response:
+            return response
+        response = super().dispatch(request, *args, **kwargs)
+        context = getattr(response, 'context_data', None)
+        if response.status_code == HTTPStatus.OK and context is not None:
+            etag, last_modified = self.validator_headers(
+                *self.context_validators(context)
+            )
+            response['ETag'] = etag
+            if last_modified:
+                response['Last-Modified'] = http_date(last_modified)
+        return response
+
+
+class PageValidatorsMixin(ConditionalGetMixin):
+    """Валидаторы списка по публикациям его текущей страницы."""
+
+    def get_validators(self):
+        queryset = self.get_queryset().select_related(None).only(
+            *self.validator_fields
+        )
+        _, page, _, _ = self.paginate_queryset(
+            queryset, self.get_paginate_by(queryset)
+        )
+        return self.page_validators(page)
+
+
+class ReplicaReadMixin:
+    """Миксин чтения с реплики для страниц, которые только читают.
+
+    Запросы, меняющие данные, зрители с кукой недавней записи
+    и собственные страницы автора (reads_own_content()) остаются
+    на основной базе. Там же собираются страницы для общего кэша:
+    отстающая реплика закрепила бы в нём устаревшую версию под
+    новой версией тегов до истечения PAGE_CACHE_TTL.
+    """
+
+    def reads_own_content(self):
+        return False
+
+    def dispatch(self, request, *args, **kwargs):
+        # Пользователь загружается здесь, с основной базы: только что
+        # созданной сессии на реплике может ещё не быть.
+        if (
+            not settings.DATABASE_REPLICAS
+            or request.method not in ('GET', 'HEAD')
+            or prefers_primary(request)
+            or request.user.is_authenticated and self.reads_own_content()
+            or isinstance(self, AnonymousPageCacheMixin)
+            and self.caches_request(request)
+        ):
+            return super().dispatch(request, *args, **kwargs)
+        with read_from_replica():
+            response = super().dispatch(request, *args, **kwargs)
+            if not getattr(response, 'is_rendered', True):
+                response.render()
+        return response
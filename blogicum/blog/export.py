@@ -0,0 +1,73 @@
+import csv
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from .constants import EXPORT_CHUNK_SIZE
+from .models import Comment, Post
+
+EXPORTS = {
+    'posts': (Post, {
+        'id': 'pk',
+        'title': 'title',
+        'text': 'text',
+        'pub_date': 'pub_date',
+        'created_at': 'created_at',
+        'updated_at': 'updated_at',
+        'is_published': 'is_published',
+        'is_visible': 'is_visible',
+        'author': 'author__username',
+        'category': 'category__slug',
+        'location': 'location__name',
+        'comment_count': 'comment_count',
+    }),
+    'comments': (Comment, {
+        'id': 'pk',
+        'post': 'post_id',
+        'parent': 'parent_id',
+        'author': 'author__username',
+        'created_at': 'created_at',
+        'text': 'text',
+    }),
+}
+
+FORMATS = {
+    'csv': 'text/csv; charset=utf-8',
+    'jsonl': 'application/x-ndjson; charset=utf-8',
+}
+
+
+class Echo:
+    """Файлоподобный объект для csv.writer: строку не пишет, а отдаёт."""
+
+    def write(self, value):
+        return value
+
+
+def export_rows(kind, chunk_size=EXPORT_CHUNK_SIZE):
+    """Заголовок и кортежи строк, читаемые из базы порциями."""
+    model, columns = EXPORTS[kind]
+    rows = model.objects.order_by('pk').values_list(
+        *columns.values()
+    ).iterator(chunk_size=chunk_size)
+    return list(columns), rows
+
+
+def csv_lines(header, rows):
+    writer = csv.writer(Echo())
+    yield writer.writerow(header)
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def jsonl_lines(header, rows):
+    encoder = DjangoJSONEncoder(ensure_ascii=False)
+    for row in rows:
+        yield encoder.encode(dict(zip(header, row))) + '\n'
+
+
+def export_lines(kind, fmt, chunk_size=EXPORT_CHUNK_SIZE):
+    """Строки выгрузки kind в формате fmt, без накопления в памяти."""
+    header, rows = export_rows(kind, chunk_size)
+    if fmt == 'csv':
+        return csv_lines(header, rows)
+    return jsonl_lines(header, rows)
@@ -0,0 +1,158 @@
+import hashlib
+from http import HTTPStatus
+
+from django.contrib.auth.models import User
+from django.contrib.syndication.views import Feed
+from django.http import HttpResponse
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.utils.cache import get_conditional_response
+from django.utils.feedgenerator import Atom1Feed
+from django.utils.http import http_date, parse_http_date_safe, quote_etag
+
+from .cache import FEED_TAG, get_cached_page, set_cached_page
+from .constants import FEED_LIMIT
+from .models import Category, Post
+
+
+class CachedFeed(Feed):
+    """Лента публикаций в общем кэше страниц с условным GET.
+
+    Содержимое ленты не зависит от зрителя, поэтому кэшируется
+    для всех. Кэш сбрасывается по тегам get_cache_tags() при
+    публикации или правке поста, а ETag и Last-Modified позволяют
+    отвечать опрашивающим читалкам 304 без обращения к базе.
+    """
+
+    query_budget = 2
+
+    def get_cache_tags(self, obj):
+        return [FEED_TAG]
+
+    def get_posts(self, obj):
+        return Post.objects.published()
+
+    def items(self, obj):
+        return self.get_posts(obj).for_feed().order_by(
+            '-pub_date', '-id'
+        )[:FEED_LIMIT]
+
+    def item_title(self, item):
+        return item.title
+
+    def item_description(self, item):
+        return item.text
+
+    def item_link(self, item):
+        return reverse('blog:post_detail', kwargs={'post_id': item.pk})
+
+    def item_author_name(self, item):
+        return item.author.username
+
+    def item_pubdate(self, item):
+        return item.pub_date
+
+    def item_updateddate(self, item):
+        return item.updated_at
+
+    def render(self, request, *args, **kwargs):
+        obj = self.get_object(request, *args, **kwargs)
+        feed = self.get_feed(obj, request)
+        response = HttpResponse(content_type=feed.content_type)
+        feed.write(response, 'utf-8')
+        response['ETag'] = quote_etag(hashlib.md5(
+            response.content, usedforsecurity=False
+        ).hexdigest())
+        latest = feed.latest_post_date()
+        if latest:
+            response['Last-Modified'] = http_date(latest.timestamp())
+        set_cached_page(request, response, self.get_cache_tags(obj))
+        return response
+
+    def __call__(self, request, *args, **kwargs):
+        response = get_cached_page(request) or self.render(
+            request, *args, **kwargs
+        )
+        if response.status_code != HTTPStatus.OK:
+            return response
+        return get_conditional_response(
+            request,
+            etag=response['ETag'],
+            last_modified=parse_http_date_safe(
+                response.get('Last-Modified', '')
+            ),
+            response=response,
+        )
+
+
+class LatestPostsFeed(CachedFeed):
+    title = 'Блогикум'
+    description = 'Новые публикации.'
+
+    def link(self):
+        return reverse('blog:index')
+
+
+class CategoryFeed(CachedFeed):
+
+    def get_object(self, request, category_slug):
+        return get_object_or_404(
+            Category, slug=category_slug, is_published=True
+        )
+
+    def get_cache_tags(self, obj):
+        return [f'category:{obj.pk}']
+
+    def get_posts(self, obj):
+        return super().get_posts(obj).filter(category=obj)
+
+    def title(self, obj):
+        return f'Блогикум: {obj.title}'
+
+    def description(self, obj):
+        return obj.description
+
+    def link(self, obj):
+        return reverse(
+            'blog:category_posts', kwargs={'category_slug': obj.slug}
+        )
+
+
+class ProfileFeed(CachedFeed):
+
+    def get_object(self, request, username):
+        return get_object_or_404(User, username=username, is_active=True)
+
+    def get_cache_tags(self, obj):
+        return [f'user:{obj.pk}']
+
+    def get_posts(self, obj):
+        return super().get_posts(obj).filter(author=obj)
+
+    def title(self, obj):
+        return f'Блогикум: {obj.username}'
+
+    def description(self, obj):
+        return f'Публикации пользователя {obj.username}.'
+
+    def link(self, obj):
+        return reverse('blog:profile', kwargs={'username': obj.username})
+
+
+class LatestPostsAtomFeed(LatestPostsFeed):
+    feed_type = Atom1Feed
+    subtitle = LatestPostsFeed.description
+
+
+class CategoryAtomFeed(CategoryFeed):
+    feed_type = Atom1Feed
+
+    def subtitle(self, obj):
+        return self.description(obj)
+
+
+class ProfileAtomFeed(ProfileFeed):
+    feed_type = Atom1Feed
+
+    def subtitle(self, obj):
+        return self.description(obj)
@@ -9,6 +9,12 @@ class CommentForm(forms.ModelForm):
         fields = ('text', )
 
 
+class ReplyForm(CommentForm):
+    class Meta(CommentForm.Meta):
+        fields = ('text', 'parent')
+        widgets = {'parent': forms.HiddenInput}
+
+
 class ProfileEditForm(forms.ModelForm):
     class Meta:
         model = User
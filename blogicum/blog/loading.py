@@ -0,0 +1,221 @@
+import json
+import tempfile
+from contextlib import contextmanager
+from itertools import islice
+from pathlib import Path
+
+from django.apps import apps
+from django.core.management.color import no_style
+from django.core.serializers import python
+from django.db import connection, reset_queries, transaction
+from django.utils import timezone
+
+READ_SIZE = 1 << 16
+
+WHITESPACE = ' \t\n\r'
+
+
+def batches(iterable, size):
+    """Порции iterable по size элементов в виде списков.
+
+    После каждой порции сбрасывается журнал запросов: с DEBUG он
+    хранит тысячи INSERT.
+    """
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+        reset_queries()
+
+
+class ArrayReader:
+    """Элементы JSON-массива верхнего уровня по одному.
+
+    Файл читается порциями по read_size символов, в памяти держится
+    только недоразобранный хвост, поэтому размер дампа не важен.
+    """
+
+    decoder = json.JSONDecoder()
+
+    def __init__(self, stream, read_size=READ_SIZE):
+        self.stream = stream
+        self.read_size = read_size
+        self.buffer, self.position = '', 0
+
+    def fill(self):
+        data = self.stream.read(self.read_size)
+        self.buffer = self.buffer[self.position:] + data
+        self.position = 0
+        return bool(data)
+
+    def next_char(self, separators):
+        """Первый символ после separators или '' в конце файла."""
+        while True:
+            while (
+                self.position < len(self.buffer)
+                and self.buffer[self.position] in separators
+            ):
+                self.position += 1
+            if self.position < len(self.buffer) or not self.fill():
+                return self.buffer[self.position:self.position + 1]
+
+    def __iter__(self):
+        if self.next_char(WHITESPACE) != '[':
+            raise ValueError('Дамп должен быть JSON-массивом объектов.')
+        self.position += 1
+        while (char := self.next_char(WHITESPACE + ',')) != ']':
+            if not char:
+                raise ValueError('Дамп оборван: нет закрывающей «]».')
+            try:
+                item, self.position = self.decoder.raw_decode(
+                    self.buffer, self.position
+                )
+            except json.JSONDecodeError:
+                if not self.fill():
+                    raise
+                continue
+            yield item
+
+
+def dependency_order(models):
+    """Модели так, чтобы связанные шли раньше ссылающихся на них."""
+    models = set(models)
+    ordered, visited = [], set()
+
+    def visit(model):
+        if model in visited:
+            return
+        visited.add(model)
+        for field in model._meta.get_fields():
+            related = field.related_model
+            if (
+                (field.many_to_one or field.one_to_one or field.many_to_many)
+                and field.concrete
+                and related in models
+                and related is not model
+            ):
+                visit(related)
+        ordered.append(model)
+
+    for model in sorted(models, key=lambda model: model._meta.label):
+        visit(model)
+    return ordered
+
+
+def split_by_model(stream, directory):
+    """Раскладывает записи дампа по файлам JSON Lines, по файлу на модель."""
+    files, counts = {}, {}
+    try:
+        for record in ArrayReader(stream):
+            label = record['model'].lower()
+            if label not in files:
+                files[label] = open(
+                    Path(directory) / f'{label}.jsonl', 'w', encoding='utf-8'
+                )
+                counts[label] = 0
+            files[label].write(json.dumps(record, ensure_ascii=False))
+            files[label].write('\n')
+            counts[label] += 1
+    finally:
+        for file in files.values():
+            file.close()
+    return counts
+
+
+@contextmanager
+def keep_dates(model):
+    """Даты из дампа не перезаписываются auto_now и auto_now_add.
+
+    bulk_create, в отличие от сохранения в loaddata, всегда вызывает
+    pre_save(), поэтому флаги на время загрузки снимаются.
+    """
+    fields = [
+        field for field in model._meta.concrete_fields
+        if getattr(field, 'auto_now', False)
+        or getattr(field, 'auto_now_add', False)
+    ]
+    flags = [(field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield fields
+    finally:
+        for field, (auto_now, auto_now_add) in zip(fields, flags):
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+def save_batch(model, records, date_fields=()):
+    """Вставляет порцию записей одной модели, перезаписывая совпавшие pk.
+
+    Дата из date_fields, которой нет в дампе старой схемы,
+    получает текущее время.
+    """
+    deserialized = list(python.Deserializer(records, ignorenonexistent=True))
+    now = timezone.now()
+    for field in date_fields:
+        for item in deserialized:
+            if getattr(item.object, field.attname) is None:
+                setattr(item.object, field.attname, now)
+    update_fields = [
+        field.name for field in model._meta.concrete_fields
+        if not field.primary_key
+    ]
+    model._base_manager.bulk_create(
+        [item.object for item in deserialized],
+        update_conflicts=bool(update_fields),
+        unique_fields=[model._meta.pk.name] if update_fields else None,
+        update_fields=update_fields or None,
+    )
+    for field in model._meta.many_to_many:
+        through = field.remote_field.through
+        source = field.m2m_field_name()
+        target = field.m2m_reverse_field_name()
+        loaded = [
+            item for item in deserialized if field.name in item.m2m_data
+        ]
+        if not loaded:
+            continue
+        through._base_manager.filter(**{
+            f'{source}__in': [item.object.pk for item in loaded]
+        }).delete()
+        through._base_manager.bulk_create([
+            through(**{f'{source}_id': item.object.pk, f'{target}_id': pk})
+            for item in loaded
+            for pk in item.m2m_data[field.name]
+        ])
+
+
+def load_dump(stream, batch_size=2000, on_model=None):
+    """Загружает дамп формата dumpdata с постоянным расходом памяти.
+
+    Записи раскладываются по временным файлам, затем модели
+    вставляются порциями в порядке зависимостей в одной транзакции.
+    Внешние ключи проверяются один раз в конце, как в loaddata,
+    после чего сбрасываются последовательности первичных ключей.
+    on_model(модель, строк) вызывается после загрузки каждой модели.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        counts = split_by_model(stream, directory)
+        models = dependency_order(
+            apps.get_model(label) for label in counts
+        )
+        with transaction.atomic(), connection.constraint_checks_disabled():
+            for model in models:
+                label = model._meta.label_lower
+                path = Path(directory) / f'{label}.jsonl'
+                with (
+                    open(path, encoding='utf-8') as file,
+                    keep_dates(model) as date_fields,
+                ):
+                    for batch in batches(map(json.loads, file), batch_size):
+                        save_batch(model, batch, date_fields)
+                if on_model is not None:
+                    on_model(model, counts[label])
+            connection.check_constraints(
+                table_names=[model._meta.db_table for model in models]
+            )
+            with connection.cursor() as cursor:
+                for sql in connection.ops.sequence_reset_sql(
+                    no_style(), models
+                ):
+                    cursor.execute(sql)
+    return models
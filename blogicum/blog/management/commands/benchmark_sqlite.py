@@ -0,0 +1,194 @@
+import random
+import sqlite3
+import statistics
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from core.db import pragma_statements
+
+SCHEMA = (
+    'CREATE TABLE post ('
+    'id INTEGER PRIMARY KEY, title TEXT, comment_count INTEGER)',
+    'CREATE TABLE comment ('
+    'id INTEGER PRIMARY KEY, post_id INTEGER, text TEXT, created_at REAL)',
+    'CREATE INDEX comment_post_idx ON comment (post_id, id)',
+)
+
+PROFILES = {
+    'default': {
+        'pragmas': {},
+        'persistent': False,
+        'begin': 'BEGIN',
+    },
+    'tuned': {
+        'pragmas': settings.SQLITE_PRAGMAS,
+        'persistent': True,
+        'begin': 'BEGIN IMMEDIATE',
+    },
+}
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает SQLite с настройками по умолчанию и профиль '
+        'SQLITE_PRAGMAS + CONN_MAX_AGE на смеси чтения ленты '
+        'и конкурентной записи комментариев.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--threads',
+            type=int,
+            nargs='+',
+            default=[1, 4, 16],
+            help='Сколько потоков одновременно обращаются к базе.'
+        )
+        parser.add_argument(
+            '--duration',
+            type=float,
+            default=3.0,
+            help='Длительность замера для профиля и числа потоков, сек.'
+        )
+        parser.add_argument(
+            '--write-ratio',
+            type=float,
+            default=0.2,
+            help='Доля операций, которые пишут комментарий.'
+        )
+        parser.add_argument(
+            '--posts',
+            type=int,
+            default=2000,
+            help='Сколько публикаций во временной базе.'
+        )
+
+    def handle(self, *args, threads, duration, write_ratio, posts,
+               **options):
+        self.stdout.write(
+            f'{"профиль":<9}{"потоки":>7}{"оп/с":>10}'
+            f'{"p99, мс":>10}{"locked":>8}'
+        )
+        for level in threads:
+            for name, profile in PROFILES.items():
+                with tempfile.TemporaryDirectory() as directory:
+                    path = Path(directory) / 'bench.sqlite3'
+                    self.prepare(path, posts, profile)
+                    latencies, errors, elapsed = self.run(
+                        path, profile, level, duration, write_ratio, posts
+                    )
+                p99 = (
+                    statistics.quantiles(latencies, n=100)[98] * 1000
+                    if len(latencies) > 1 else 0
+                )
+                self.stdout.write(
+                    f'{name:<9}{level:>7}{len(latencies) / elapsed:>10.1f}'
+                    f'{p99:>10.1f}{errors:>8}'
+                )
+
+    def connect(self, path, profile):
+        """Соединение как у Django: автокоммит, таймаут 5 с и PRAGMA."""
+        connection = sqlite3.connect(
+            path, timeout=5, isolation_level=None, check_same_thread=False
+        )
+        for statement in pragma_statements(profile['pragmas']):
+            connection.execute(statement)
+        return connection
+
+    def prepare(self, path, posts, profile):
+        connection = self.connect(path, profile)
+        for statement in SCHEMA:
+            connection.execute(statement)
+        connection.execute('BEGIN')
+        connection.executemany(
+            'INSERT INTO post (id, title, comment_count) VALUES (?, ?, 0)',
+            ((pk, f'Публикация {pk}') for pk in range(1, posts + 1)),
+        )
+        connection.execute('COMMIT')
+        connection.close()
+
+    def run(self, path, profile, level, duration, write_ratio, posts):
+        """Потоки выполняют «запросы» до истечения времени."""
+        latencies, errors = [], []
+        deadline = time.perf_counter() + duration
+
+        def worker(seed):
+            worker_latencies, worker_errors = self.work(
+                path, profile, deadline, random.Random(seed),
+                write_ratio, posts,
+            )
+            latencies.extend(worker_latencies)
+            errors.append(worker_errors)
+
+        started = time.perf_counter()
+        workers = [
+            threading.Thread(target=worker, args=(seed,))
+            for seed in range(level)
+        ]
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+        return latencies, sum(errors), time.perf_counter() - started
+
+    def work(self, path, profile, deadline, rng, write_ratio, posts):
+        """Цикл одного потока.
+
+        Без постоянных соединений каждый запрос открывает своё,
+        как при CONN_MAX_AGE = 0.
+        """
+        latencies, errors = [], 0
+        persistent = (
+            self.connect(path, profile) if profile['persistent'] else None
+        )
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            connection = persistent or self.connect(path, profile)
+            try:
+                if rng.random() < write_ratio:
+                    self.write(connection, profile, rng.randint(1, posts))
+                else:
+                    self.read(connection, rng.randint(1, posts))
+                latencies.append(time.perf_counter() - start)
+            except sqlite3.OperationalError:
+                errors += 1
+            finally:
+                if persistent is None:
+                    connection.close()
+        if persistent is not None:
+            persistent.close()
+        return latencies, errors
+
+    def read(self, connection, post_id):
+        connection.execute(
+            'SELECT id, title, comment_count FROM post '
+            'ORDER BY id DESC LIMIT 10'
+        ).fetchall()
+        connection.execute(
+            'SELECT id, text FROM comment WHERE post_id = ? '
+            'ORDER BY id LIMIT 20',
+            [post_id],
+        ).fetchall()
+
+    def write(self, connection, profile, post_id):
+        """Комментарий и счётчик публикации в одной транзакции."""
+        connection.execute(profile['begin'])
+        try:
+            connection.execute(
+                'INSERT INTO comment (post_id, text, created_at) '
+                'VALUES (?, ?, ?)',
+                [post_id, 'Комментарий', time.time()],
+            )
+            connection.execute(
+                'UPDATE post SET comment_count = comment_count + 1 '
+                'WHERE id = ?',
+                [post_id],
+            )
+            connection.execute('COMMIT')
+        except sqlite3.OperationalError:
+            connection.execute('ROLLBACK')
+            raise
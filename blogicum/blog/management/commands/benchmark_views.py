@@ -0,0 +1,135 @@
+import asyncio
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.test import AsyncClient, Client
+
+from blog.management.utils import production_settings
+
+MODES = ('wsgi', 'asgi-sync', 'asgi-async')
+
+
+def split(total, workers):
+    return [total // workers + (i < total % workers) for i in range(workers)]
+
+
+def check(response, path):
+    if response.status_code != HTTPStatus.OK:
+        raise CommandError(f'{path} ответил {response.status_code}.')
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает запросы в секунду и задержки страницы: синхронный вид '
+        'под WSGI, он же под ASGI и асинхронный вариант из async_views.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--path',
+            default='/',
+            help='Страница синхронного вида; асинхронная — /async<path>.'
+        )
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            nargs='+',
+            default=[1, 8, 32],
+            help='Уровни конкурентности: потоки для WSGI, задачи для ASGI.'
+        )
+        parser.add_argument(
+            '--requests',
+            type=int,
+            default=200,
+            help='Запросов на каждый режим и уровень конкурентности.'
+        )
+        parser.add_argument(
+            '--username',
+            help='Ходить от этого пользователя, мимо кэша страниц.'
+        )
+
+    def handle(self, *args, path, concurrency, requests, username,
+               **options):
+        user = None
+        if username:
+            user = User.objects.filter(username=username).first()
+            if user is None:
+                raise CommandError(f'Нет пользователя {username}.')
+        self.stdout.write(
+            f'{"режим":<11}{"конк.":>6}{"зап/с":>10}'
+            f'{"p50, мс":>10}{"p95, мс":>10}{"p99, мс":>10}'
+        )
+        for level in concurrency:
+            for mode in MODES:
+                with production_settings():
+                    latencies, elapsed = self.run(
+                        mode, path, level, requests, user
+                    )
+                cuts = statistics.quantiles(latencies, n=100)
+                self.stdout.write(
+                    f'{mode:<11}{level:>6}{len(latencies) / elapsed:>10.1f}'
+                    f'{cuts[49] * 1000:>10.1f}{cuts[94] * 1000:>10.1f}'
+                    f'{cuts[98] * 1000:>10.1f}'
+                )
+
+    def run(self, mode, path, level, total, user):
+        """Прогрев одним запросом, затем замер."""
+        if mode == 'wsgi':
+            self.run_wsgi(path, 1, 1, user)
+            return self.run_wsgi(path, level, total, user)
+        if mode == 'asgi-async':
+            path = f'/async{path}'
+        asyncio.run(self.run_asgi(path, 1, 1, user))
+        return asyncio.run(self.run_asgi(path, level, total, user))
+
+    def run_wsgi(self, path, level, total, user):
+        """Потоки с синхронным клиентом, как воркеры gunicorn --threads."""
+        clients = [Client() for _ in range(level)]
+        if user is not None:
+            for client in clients:
+                client.force_login(user)
+
+        def worker(client, count):
+            latencies = []
+            try:
+                for _ in range(count):
+                    start = time.perf_counter()
+                    response = client.get(path)
+                    latencies.append(time.perf_counter() - start)
+                    check(response, path)
+            finally:
+                connections.close_all()
+            return latencies
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(level) as pool:
+            results = list(pool.map(worker, clients, split(total, level)))
+        return sum(results, []), time.perf_counter() - start
+
+    async def run_asgi(self, path, level, total, user):
+        """Задачи в одном цикле событий, как воркер uvicorn."""
+        clients = [AsyncClient() for _ in range(level)]
+        if user is not None:
+            for client in clients:
+                await client.aforce_login(user)
+
+        async def worker(client, count):
+            latencies = []
+            for _ in range(count):
+                start = time.perf_counter()
+                response = await client.get(path)
+                latencies.append(time.perf_counter() - start)
+                check(response, path)
+            return latencies
+
+        start = time.perf_counter()
+        results = await asyncio.gather(*(
+            worker(client, count)
+            for client, count in zip(clients, split(total, level))
+        ))
+        return sum(results, []), time.perf_counter() - start
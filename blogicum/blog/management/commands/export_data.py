@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand
+
+from blog.constants import EXPORT_CHUNK_SIZE
+from blog.export import EXPORTS, FORMATS, export_lines
+
+
+class Command(BaseCommand):
+    help = (
+        'Выгружает публикации или комментарии в CSV или JSON Lines, '
+        'читая базу порциями: память не растёт с числом строк.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('kind', choices=list(EXPORTS))
+        parser.add_argument(
+            '--format',
+            dest='fmt',
+            choices=list(FORMATS),
+            default='csv'
+        )
+        parser.add_argument(
+            '--output',
+            help='Файл для выгрузки; по умолчанию стандартный вывод.'
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=EXPORT_CHUNK_SIZE,
+            help='Сколько строк читать из базы за раз.'
+        )
+
+    def handle(self, *args, kind, fmt, output, chunk_size, **options):
+        lines = export_lines(kind, fmt, chunk_size)
+        if output is None:
+            for line in lines:
+                self.stdout.write(line, ending='')
+            return
+        with open(output, 'w', encoding='utf-8', newline='') as file:
+            file.writelines(lines)
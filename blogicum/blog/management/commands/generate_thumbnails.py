@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+
+from blog.cache import invalidate_post_card
+from blog.models import Post
+from blog.thumbnails import generate_thumbnails
+
+
+class Command(BaseCommand):
+    help = 'Создаёт недостающие миниатюры для изображений постов.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Пересоздать и уже существующие миниатюры.'
+        )
+
+    def handle(self, *args, force, **options):
+        posts = Post.objects.exclude(image='').only('pk', 'image')
+        created = failed = 0
+        for post in posts.iterator(chunk_size=500):
+            try:
+                made = generate_thumbnails(post.image, force=force)
+            except OSError as error:
+                failed += 1
+                self.stderr.write(f'{post.image.name}: {error}')
+                continue
+            if made:
+                created += made
+                invalidate_post_card(post.pk)
+        self.stdout.write(self.style.SUCCESS(
+            f'Создано миниатюр: {created}, ошибок: {failed}'
+        ))
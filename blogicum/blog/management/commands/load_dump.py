@@ -0,0 +1,56 @@
+import gzip
+import time
+
+from django.core.management.base import BaseCommand
+
+from blog.cache import SITE_TAG, invalidate_tags
+from blog.loading import load_dump
+from blog.models import Comment, Post
+from blog.paginators import invalidate_counts
+from blog.search import reindex_posts
+from blog.seed import count_comments, fill_comment_paths
+
+
+class Command(BaseCommand):
+    help = (
+        'Потоково загружает дамп формата dumpdata, например db.json: '
+        'файл не читается в память целиком, объекты вставляются '
+        'порциями в порядке зависимостей моделей.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='JSON-дамп, можно сжатый .gz.')
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=2000,
+            help='Сколько объектов одной модели вставлять за раз.'
+        )
+
+    def handle(self, *args, path, batch_size, **options):
+        rows = 0
+
+        def report(model, count):
+            nonlocal rows
+            rows += count
+            self.stdout.write(f'{model._meta.label:<24}{count:>12}')
+
+        start = time.perf_counter()
+        opener = gzip.open if path.endswith('.gz') else open
+        with opener(path, 'rt', encoding='utf-8') as stream:
+            models = load_dump(stream, batch_size, on_model=report)
+        if Post in models or Comment in models:
+            self.refresh_blog()
+        elapsed = time.perf_counter() - start
+        self.stdout.write(self.style.SUCCESS(
+            f'Загружено {rows} объектов за {elapsed:.1f} с.'
+        ))
+
+    def refresh_blog(self):
+        """Поля, которые в обычной работе ведут save() и сигналы."""
+        Post.objects.due().update(is_visible=True)
+        fill_comment_paths()
+        count_comments()
+        reindex_posts()
+        invalidate_counts()
+        invalidate_tags(SITE_TAG)
@@ -0,0 +1,212 @@
+import json
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.db import connection, connections
+from django.test import Client
+from django.test.utils import setup_databases, teardown_databases
+from django.urls import URLResolver, get_resolver, reverse
+
+from blog.management.utils import production_settings
+from blog.models import Comment, Post, User
+from blog.seed import seed
+
+NAMESPACES = ('blog', 'pages')
+
+
+def discover_routes():
+    """Имена и параметры всех маршрутов из blog.urls и pages.urls."""
+    for resolver in get_resolver().url_patterns:
+        if (
+            isinstance(resolver, URLResolver)
+            and resolver.namespace in NAMESPACES
+        ):
+            for pattern in resolver.url_patterns:
+                yield (
+                    f'{resolver.namespace}:{pattern.name}',
+                    list(pattern.pattern.converters),
+                )
+
+
+def percentile(cuts, value):
+    return round(cuts[value - 1] * 1000, 2) if cuts else 0
+
+
+class Command(BaseCommand):
+    help = (
+        'Нагрузочный прогон всех страниц blog и pages на временной базе '
+        'с синтетическими данными: задержки p50/p95/p99, запросы в секунду '
+        'и запросы к базе на страницу.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=50)
+        parser.add_argument('--posts', type=int, default=2000)
+        parser.add_argument('--comments', type=int, default=10000)
+        parser.add_argument(
+            '--requests',
+            type=int,
+            default=100,
+            help='Запросов к каждому маршруту.'
+        )
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=4,
+            help='Одновременных клиентов, каждый в своём потоке.'
+        )
+        parser.add_argument(
+            '--authenticated',
+            action='store_true',
+            help='Все страницы открывает вошедший автор, мимо кэша страниц.'
+        )
+        parser.add_argument(
+            '--json',
+            dest='json_path',
+            help='Куда сохранить отчёт в JSON.'
+        )
+
+    def handle(self, *args, users, posts, comments, requests, concurrency,
+               authenticated, json_path, **options):
+        old_config = setup_databases(verbosity=0, interactive=False)
+        try:
+            with production_settings():
+                cache.clear()
+                dataset = seed(users=users, posts=posts, comments=comments)
+                report = {
+                    'dataset': dataset,
+                    'requests': requests,
+                    'concurrency': concurrency,
+                    'routes': [
+                        self.measure(name, url, user, requests, concurrency)
+                        for name, url, user in self.build_urls(authenticated)
+                    ],
+                }
+        finally:
+            teardown_databases(old_config, verbosity=0)
+        self.write_table(report['routes'])
+        if json_path:
+            with open(json_path, 'w', encoding='utf-8') as file:
+                json.dump(report, file, ensure_ascii=False, indent=2)
+
+    def build_urls(self, authenticated=False):
+        """Адрес каждого маршрута на самой обсуждаемой публикации.
+
+        Страницы редактирования и удаления открываются её автором;
+        для них же он пишет свой комментарий. Страницы, закрытые
+        и для автора, открывает сотрудник.
+        """
+        post = Post.objects.select_related(
+            'author', 'category'
+        ).order_by('-comment_count').first()
+        comment = Comment.objects.create(
+            post=post, author=post.author, text='Комментарий автора'
+        )
+        values = {
+            'post_id': post.pk,
+            'comment_id': comment.pk,
+            'category_slug': post.category.slug,
+            'username': post.author.username,
+            'kind': 'posts',
+        }
+        query = {'blog:search': f'?q={post.title.split()[0]}'}
+        anonymous, author = Client(), Client()
+        author.force_login(post.author)
+        staff = None
+        for name, params in discover_routes():
+            url = reverse(name, kwargs={key: values[key] for key in params})
+            url += query.get(name, '')
+            response = anonymous.get(url)
+            needs_login = (
+                response.status_code == HTTPStatus.FOUND
+                and response['Location'].startswith(settings.LOGIN_URL)
+            )
+            if needs_login and (
+                author.get(url).status_code == HTTPStatus.FORBIDDEN
+            ):
+                staff = staff or User.objects.create_user(
+                    'loadtest-staff', is_staff=True
+                )
+                yield name, url, staff
+                continue
+            login = authenticated or needs_login
+            yield name, url, post.author if login else None
+
+    def measure(self, name, url, user, total, concurrency):
+        clients = [Client() for _ in range(concurrency)]
+        if user is not None:
+            for client in clients:
+                client.force_login(user)
+        clients[0].get(url)
+        counts = [
+            total // concurrency + (i < total % concurrency)
+            for i in range(concurrency)
+        ]
+        start = time.perf_counter()
+        with ThreadPoolExecutor(concurrency) as pool:
+            results = list(pool.map(self.work, clients, [url] * concurrency,
+                                    counts))
+        elapsed = time.perf_counter() - start
+        latencies = [value for result in results for value in result[0]]
+        queries = [value for result in results for value in result[1]]
+        statuses = [value for result in results for value in result[2]]
+        cuts = statistics.quantiles(latencies, n=100) if total > 1 else []
+        return {
+            'name': name,
+            'url': url,
+            'authenticated': user is not None,
+            'requests': len(latencies),
+            'rps': round(len(latencies) / elapsed, 1),
+            'p50_ms': percentile(cuts, 50),
+            'p95_ms': percentile(cuts, 95),
+            'p99_ms': percentile(cuts, 99),
+            'queries': round(statistics.fmean(queries), 2),
+            'errors': sum(status >= HTTPStatus.BAD_REQUEST
+                          for status in statuses),
+        }
+
+    def work(self, client, url, count):
+        """Запросы одного клиента; SQL считается в его соединении."""
+        latencies, queries, statuses = [], [], []
+        executed = 0
+
+        def count_query(execute, sql, params, many, context):
+            nonlocal executed
+            executed += 1
+            return execute(sql, params, many, context)
+
+        try:
+            with connection.execute_wrapper(count_query):
+                for _ in range(count):
+                    executed = 0
+                    start = time.perf_counter()
+                    response = client.get(url)
+                    latencies.append(time.perf_counter() - start)
+                    queries.append(executed)
+                    statuses.append(response.status_code)
+        finally:
+            connections.close_all()
+        return latencies, queries, statuses
+
+    def write_table(self, routes):
+        columns = (
+            ('name', 'маршрут', '<28'),
+            ('rps', 'зап/с', '>9'),
+            ('p50_ms', 'p50, мс', '>9'),
+            ('p95_ms', 'p95, мс', '>9'),
+            ('p99_ms', 'p99, мс', '>9'),
+            ('queries', 'SQL', '>7'),
+            ('errors', 'ошибки', '>8'),
+        )
+        self.stdout.write(''.join(
+            f'{title:{spec}}' for _, title, spec in columns
+        ))
+        for route in routes:
+            self.stdout.write(''.join(
+                f'{route[key]:{spec}}' for key, _, spec in columns
+            ))
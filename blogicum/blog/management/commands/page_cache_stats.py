@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from blog.cache import page_cache_stats
+
+
+class Command(BaseCommand):
+    help = 'Показывает попадания и промахи кэша страниц для анонимов.'
+
+    def handle(self, *args, **options):
+        stats = page_cache_stats()
+        total = stats['hits'] + stats['misses']
+        ratio = stats['hits'] / total if total else 0
+        self.stdout.write(
+            f'Попадания: {stats["hits"]}, промахи: {stats["misses"]}, '
+            f'доля попаданий: {ratio:.1%}'
+        )
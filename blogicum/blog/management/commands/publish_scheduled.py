@@ -0,0 +1,57 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from blog.cache import invalidate_post
+from blog.models import Post
+
+
+class Command(BaseCommand):
+    help = (
+        'Открывает отложенные публикации, время которых наступило: '
+        'выставляет is_visible и сбрасывает кэши.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Не завершаться, а проверять снова через --interval.'
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=30,
+            help='Пауза между проверками, в секундах.'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Сколько публикаций открывать за один UPDATE.'
+        )
+
+    def handle(self, *args, loop, interval, batch_size, **options):
+        while True:
+            published = self.publish_due(batch_size)
+            if published:
+                self.stdout.write(f'Открыто публикаций: {published}')
+            if not loop:
+                return
+            time.sleep(interval)
+
+    def publish_due(self, batch_size):
+        published = 0
+        while True:
+            posts = list(
+                Post.objects.due().only('pk', 'category', 'author')
+                .order_by('pub_date')[:batch_size]
+            )
+            if not posts:
+                return published
+            Post.objects.due().filter(
+                pk__in=[post.pk for post in posts]
+            ).update(is_visible=True)
+            for post in posts:
+                invalidate_post(post)
+            published += len(posts)
@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count, Max, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from blog.models import Comment, Post
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает Post.comment_count порциями по диапазонам id.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=1000,
+            help='Сколько публикаций пересчитывать за один UPDATE.'
+        )
+
+    def handle(self, *args, chunk_size, **options):
+        comments = (
+            Comment.objects.filter(post=OuterRef('pk'))
+            .values('post')
+            .annotate(total=Count('pk'))
+            .values('total')
+        )
+        actual = Coalesce(Subquery(comments), 0)
+        last_id = Post.objects.aggregate(last_id=Max('pk'))['last_id'] or 0
+        fixed = 0
+        for start in range(0, last_id + 1, chunk_size):
+            fixed += (
+                Post.objects
+                .filter(pk__gte=start, pk__lt=start + chunk_size)
+                .exclude(comment_count=actual)
+                .update(comment_count=actual)
+            )
+        self.stdout.write(
+            self.style.SUCCESS(f'Исправлено публикаций: {fixed}')
+        )
@@ -0,0 +1,80 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from blog.seed import fast_load, seed
+
+
+class Command(BaseCommand):
+    help = (
+        'Заполняет базу синтетическими пользователями, категориями, '
+        'местами, публикациями и комментариями для нагрузочных прогонов '
+        'и показывает скорость вставки, строк в секунду.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=10_000)
+        parser.add_argument('--categories', type=int, default=50)
+        parser.add_argument('--locations', type=int, default=500)
+        parser.add_argument('--posts', type=int, default=200_000)
+        parser.add_argument('--comments', type=int, default=1_000_000)
+        parser.add_argument(
+            '--future-share',
+            type=float,
+            default=0.05,
+            help='Доля отложенных публикаций с pub_date в будущем.'
+        )
+        parser.add_argument(
+            '--hidden-share',
+            type=float,
+            default=0.02,
+            help='Доля публикаций, снятых с публикации.'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=5000,
+            help='Сколько строк вставлять за одну транзакцию.'
+        )
+        parser.add_argument('--random-seed', type=int, default=0)
+        parser.add_argument(
+            '--keep-indexes',
+            action='store_true',
+            help='Не снимать индексы и проверку внешних ключей на время '
+                 'загрузки, например если база уже используется.'
+        )
+
+    def handle(self, *args, users, categories, locations, posts, comments,
+               future_share, hidden_share, batch_size, random_seed,
+               keep_indexes, **options):
+        def report(label, inserted, seconds):
+            rate = inserted / seconds if seconds else 0
+            self.stdout.write(
+                f'{label:<24}{inserted:>12}{seconds:>9.1f} с'
+                f'{rate:>12.0f} строк/с'
+            )
+
+        params = {
+            'users': users,
+            'categories': categories,
+            'locations': locations,
+            'posts': posts,
+            'comments': comments,
+            'batch_size': batch_size,
+            'random_seed': random_seed,
+            'future_share': future_share,
+            'hidden_share': hidden_share,
+            'on_step': report,
+        }
+        start = time.perf_counter()
+        if keep_indexes:
+            seed(**params)
+        else:
+            with fast_load():
+                seed(**params)
+        elapsed = time.perf_counter() - start
+        rows = users + categories + locations + posts + comments
+        self.stdout.write(self.style.SUCCESS(
+            f'Всего {rows} строк за {elapsed:.1f} с, '
+            f'{rows / elapsed:.0f} строк/с, с построением индексов.'
+        ))
@@ -0,0 +1,13 @@
+from django.conf import settings
+from django.test.utils import override_settings
+
+
+def production_settings():
+    """Настройки замеров как в продакшене.
+
+    Без DEBUG не пишется журнал запросов и не подключается
+    django-debug-toolbar; testserver нужен тестовому клиенту.
+    """
+    return override_settings(
+        DEBUG=False, ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver']
+    )
@@ -1,15 +1,67 @@
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import User
-from django.db import models
+from django.db import models, transaction
 from django.utils import timezone
 
 from core.models import CreatedModel
 
-from .constants import MAX_LENGTH
+from .constants import COMMENT_MAX_DEPTH, COMMENT_PATH_STEP, MAX_LENGTH
 
 User = get_user_model()
 
 
+class PublishedPostQuerySet(models.QuerySet):
+    """Выборки публикаций с правилами видимости и подгрузкой связей."""
+
+    FEED_FIELDS = (
+        'title',
+        'text',
+        'pub_date',
+        'image',
+        'is_published',
+        'comment_count',
+        'updated_at',
+        'author__username',
+        'category__title',
+        'category__slug',
+        'category__is_published',
+        'location__name',
+        'location__is_published',
+    )
+
+    @staticmethod
+    def published_condition():
+        return models.Q(is_visible=True, category__is_published=True)
+
+    def published(self):
+        """Публикации, видимые всем посетителям.
+
+        Условие не зависит от текущего времени: отложенные посты
+        открывает команда publish_scheduled, выставляя is_visible.
+        """
+        return self.filter(self.published_condition())
+
+    def due(self):
+        """Отложенные публикации, время которых уже наступило."""
+        return self.filter(
+            is_visible=False, is_published=True, pub_date__lte=timezone.now()
+        )
+
+    def visible_to(self, user):
+        """Опубликованное плюс все собственные публикации автора."""
+        if not user.is_authenticated:
+            return self.published()
+        return self.filter(
+            models.Q(author=user) | self.published_condition()
+        )
+
+    def for_feed(self):
+        """Всё, что нужно карточке поста, одним запросом."""
+        return self.select_related(
+            'author', 'category', 'location'
+        ).only(*self.FEED_FIELDS)
+
+
 class Post(CreatedModel):
     title = models.CharField(
         max_length=MAX_LENGTH,
@@ -48,15 +100,56 @@ class Post(CreatedModel):
         verbose_name='Категория',
         related_name='posts'
     )
+    comment_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Количество комментариев'
+    )
+
+    is_visible = models.BooleanField(
+        default=False,
+        editable=False,
+        verbose_name='Видна читателям',
+        help_text='Опубликовано и время публикации наступило.'
+    )
+
+    objects = PublishedPostQuerySet.as_manager()
 
     class Meta:
         verbose_name = 'публикация'
         verbose_name_plural = 'Публикации'
         ordering = ['-pub_date']
+        indexes = [
+            models.Index(
+                fields=['-pub_date', '-id'],
+                condition=models.Q(is_visible=True),
+                name='post_visible_feed_idx',
+            ),
+            models.Index(
+                fields=['category', '-pub_date', '-id'],
+                condition=models.Q(is_visible=True),
+                name='post_visible_category_idx',
+            ),
+            models.Index(
+                fields=['author', '-pub_date', '-id'],
+                name='post_author_feed_idx',
+            ),
+        ]
 
     def __str__(self):
         return self.title
 
+    def save(self, *args, **kwargs):
+        self.is_visible = bool(
+            self.is_published
+            and self.pub_date
+            and self.pub_date <= timezone.now()
+        )
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            kwargs['update_fields'] = {*update_fields, 'is_visible'}
+        super().save(*args, **kwargs)
+
 
 class Category(CreatedModel):
     title = models.CharField(
@@ -95,6 +188,22 @@ class Location(CreatedModel):
         return self.name
 
 
+class CommentQuerySet(models.QuerySet):
+    """Выборки ветвей комментариев по материализованному пути."""
+
+    def thread(self, comment):
+        """Комментарий и все ответы на него в порядке обхода дерева.
+
+        Пути потомков начинаются с пути комментария, а цифры в пути
+        меньше «:», поэтому ветвь — это диапазон по индексу (post, path).
+        """
+        return self.filter(
+            post_id=comment.post_id,
+            path__gte=comment.path,
+            path__lt=comment.path + ':',
+        ).order_by('path')
+
+
 class Comment(models.Model):
     text = models.TextField(verbose_name='Введите комментарий')
     post = models.ForeignKey(
@@ -110,8 +219,52 @@ class Comment(models.Model):
     created_at = models.DateTimeField(
         auto_now_add=True,
         verbose_name='Дата создания')
+    parent = models.ForeignKey(
+        'self',
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        verbose_name='Ответ на',
+        related_name='replies'
+    )
+    path = models.CharField(
+        max_length=255,
+        default='',
+        editable=False,
+        verbose_name='Путь в ветке',
+        help_text='id предков и самого комментария, по '
+                  f'{COMMENT_PATH_STEP} цифр на звено.'
+    )
+
+    objects = CommentQuerySet.as_manager()
 
     class Meta:
         verbose_name = 'комментарий'
         verbose_name_plural = 'комментарии'
         ordering = ['created_at']
+        indexes = [
+            models.Index(fields=['post', 'path'], name='comment_thread_idx'),
+        ]
+
+    @property
+    def depth(self):
+        return max(len(self.path) // COMMENT_PATH_STEP - 1, 0)
+
+    def save(self, *args, **kwargs):
+        """Путь нового комментария дописывается к пути родителя.
+
+        id известен только после INSERT, поэтому путь записывается
+        вторым запросом в той же транзакции.
+        """
+        if not self._state.adding:
+            return super().save(*args, **kwargs)
+        prefix = ''
+        if self.parent_id:
+            prefix = self.parent.path
+            if self.parent.depth >= COMMENT_MAX_DEPTH:
+                prefix = prefix[:-COMMENT_PATH_STEP]
+                self.parent_id = int(prefix[-COMMENT_PATH_STEP:])
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            self.path = f'{prefix}{self.pk:0{COMMENT_PATH_STEP}d}'
+            type(self).objects.filter(pk=self.pk).update(path=self.path)
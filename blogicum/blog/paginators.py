@@ -0,0 +1,295 @@
+import base64
+import binascii
+import hashlib
+import json
+from collections.abc import Sequence
+from types import SimpleNamespace
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured, ValidationError
+from django.core.paginator import Page, Paginator
+from django.db.models import Q, QuerySet
+from django.utils.functional import cached_property
+
+COUNT_VERSION_KEY = 'paginator-count-version'
+
+
+def invalidate_counts():
+    """Сбрасывает все закэшированные количества публикаций."""
+    if not cache.add(COUNT_VERSION_KEY, 1, timeout=None):
+        cache.incr(COUNT_VERSION_KEY)
+
+
+def count_signature(queryset):
+    """SQL-сигнатура выборки для ключей кэша."""
+    sql, params = queryset.values('pk').order_by().query.sql_with_params()
+    return hashlib.md5(
+        f'{queryset.db}:{sql}:{params!r}'.encode(), usedforsecurity=False
+    ).hexdigest()
+
+
+def count_cache_key(queryset):
+    """Ключ кэша по SQL-сигнатуре выборки."""
+    version = cache.get_or_set(COUNT_VERSION_KEY, 1, timeout=None)
+    return f'paginator-count:{version}:{count_signature(queryset)}'
+
+
+def large_count_cache_key(queryset):
+    """Ключ большого количества: он не сбрасывается при записи."""
+    return f'paginator-large-count:{count_signature(queryset)}'
+
+
+class ElidedPage(Page):
+    """Страница с сокращённым списком номеров для шаблона."""
+
+    @property
+    def elided_page_range(self):
+        return self.paginator.get_elided_page_range(self.number)
+
+
+class CachedCountPaginator(Paginator):
+    """Paginator, который не считает COUNT(*) на каждый запрос.
+
+    Количество хранится в кэше по сигнатуре выборки и сбрасывается
+    при записи. Количество больше PAGINATOR_COUNT_THRESHOLD точное
+    на момент подсчёта, но пересчитывается не чаще раза
+    в PAGINATOR_LARGE_COUNT_TTL: на таком объёме отставание на
+    несколько записей незаметно, а COUNT(*) дорог.
+    """
+
+    def _count_steps(self):
+        """Подсчёт количества как генератор общих шагов для count и acount.
+
+        Генератор отдаёт (объект, метод, аргументы) и получает обратно
+        результат вызова: count вызывает метод как есть, acount — его
+        асинхронный вариант с префиксом a (get → aget, count → acount).
+        """
+        key = count_cache_key(self.object_list)
+        count = yield cache, 'get', (key,)
+        if count is None:
+            large_key = large_count_cache_key(self.object_list)
+            count = yield cache, 'get', (large_key,)
+            if count is None:
+                count = yield self.object_list.order_by(), 'count', ()
+                if count > settings.PAGINATOR_COUNT_THRESHOLD:
+                    yield cache, 'set', (
+                        large_key, count, settings.PAGINATOR_LARGE_COUNT_TTL
+                    )
+            yield cache, 'set', (key, count, settings.PAGINATOR_COUNT_TTL)
+        return count
+
+    @cached_property
+    def count(self):
+        if not isinstance(self.object_list, QuerySet):
+            return super().count
+        steps, result = self._count_steps(), None
+        try:
+            while True:
+                target, method, args = steps.send(result)
+                result = getattr(target, method)(*args)
+        except StopIteration as stop:
+            return stop.value
+
+    async def acount(self):
+        """Асинхронный count: тот же кэш, запросы через async ORM."""
+        if 'count' in self.__dict__:
+            return self.count
+        if not isinstance(self.object_list, QuerySet):
+            self.count = len(self.object_list)
+            return self.count
+        steps, result = self._count_steps(), None
+        try:
+            while True:
+                target, method, args = steps.send(result)
+                result = await getattr(target, f'a{method}')(*args)
+        except StopIteration as stop:
+            self.count = stop.value
+        return self.count
+
+    async def aget_page(self, number):
+        """Как get_page, но строки страницы уже загружены."""
+        await self.acount()
+        page = self.get_page(number)
+        page.object_list = [obj async for obj in page.object_list]
+        return page
+
+    def _get_page(self, *args, **kwargs):
+        return ElidedPage(*args, **kwargs)
+
+
+class InvalidCursor(ValueError):
+    """Курсор не удалось разобрать."""
+
+
+class CursorPage(Sequence):
+    """Страница курсорной пагинации.
+
+    Повторяет интерфейс django.core.paginator.Page в той части,
+    которая нужна шаблонам: итерация, длина, has_next/has_previous.
+    """
+
+    is_cursor_page = True
+
+    def __init__(self, object_list, paginator, next_cursor=None,
+                 previous_cursor=None):
+        self.object_list = object_list
+        self.paginator = paginator
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+        self.last_cursor = paginator.last_cursor
+
+    def __repr__(self):
+        return f'<CursorPage of {len(self)} objects>'
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+class CursorPaginator:
+    """Пагинатор по ключу (keyset), без OFFSET и COUNT(*).
+
+    Страница выбирается условием вида
+    (pub_date, id) < (:pub_date, :id), поэтому первая и последняя
+    страницы стоят одинаково. Поля ordering должны однозначно
+    задавать порядок и не содержать NULL. object_list может быть
+    и выборкой values(), если в её строках есть поля ordering.
+    """
+
+    LAST = 'last'
+
+    def __init__(self, object_list, per_page, ordering=('-pub_date', '-id')):
+        self.object_list = object_list
+        self.per_page = int(per_page)
+        self.ordering = [
+            (name.lstrip('-'), name.startswith('-')) for name in ordering
+        ]
+        self.fields = [
+            object_list.model._meta.get_field(name)
+            for name, _ in self.ordering
+        ]
+        self.last_cursor = self.LAST
+
+    def row_object(self, row):
+        """Строка values() как объект для Field.value_to_string().
+
+        Значение поля ищется по attname, затем по имени: values('author')
+        отдаёт id автора под ключом author, а не author_id.
+        """
+        attrs = {}
+        for (name, _), field in zip(self.ordering, self.fields):
+            for key in (field.attname, name):
+                if key in row:
+                    attrs[field.attname] = row[key]
+                    break
+            else:
+                raise ImproperlyConfigured(
+                    f'В строке values() нет поля сортировки «{name}»: '
+                    'добавьте его в values() выборки пагинатора.'
+                )
+        return SimpleNamespace(**attrs)
+
+    def encode_cursor(self, obj, reverse=False):
+        if isinstance(obj, dict):
+            obj = self.row_object(obj)
+        values = [field.value_to_string(obj) for field in self.fields]
+        payload = json.dumps(
+            {'v': values, 'r': int(reverse)}, separators=(',', ':')
+        )
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+    def decode_cursor(self, cursor):
+        if cursor == self.LAST:
+            return None, True
+        try:
+            padded = cursor + '=' * (-len(cursor) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded))
+            values = [
+                field.to_python(value)
+                for field, value in zip(self.fields, payload['v'], strict=True)
+            ]
+            return values, bool(payload['r'])
+        except (binascii.Error, KeyError, TypeError, ValueError,
+                ValidationError) as error:
+            raise InvalidCursor(cursor) from error
+
+    def _ordering(self, reverse):
+        return [
+            f'{"-" if descending != reverse else ""}{name}'
+            for name, descending in self.ordering
+        ]
+
+    def _after(self, values, reverse):
+        """Условие «строго после values» в порядке обхода."""
+        condition = Q()
+        equal = Q()
+        for (name, descending), value in zip(self.ordering, values):
+            lookup = 'lt' if descending != reverse else 'gt'
+            condition |= equal & Q(**{f'{name}__{lookup}': value})
+            equal &= Q(**{name: value})
+        return condition
+
+    def _page_queryset(self, cursor):
+        values, reverse = (None, False)
+        if cursor:
+            values, reverse = self.decode_cursor(cursor)
+        queryset = self.object_list.order_by(*self._ordering(reverse))
+        if values is not None:
+            queryset = queryset.filter(self._after(values, reverse))
+        return queryset[:self.per_page + 1], values, reverse
+
+    def _build_page(self, rows, values, reverse):
+        has_more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+        if reverse:
+            rows.reverse()
+            has_next = values is not None
+            has_previous = has_more
+        else:
+            has_next = has_more
+            has_previous = values is not None
+        return CursorPage(
+            rows,
+            self,
+            next_cursor=(
+                self.encode_cursor(rows[-1]) if has_next and rows else None
+            ),
+            previous_cursor=(
+                self.encode_cursor(rows[0], reverse=True)
+                if has_previous and rows else None
+            ),
+        )
+
+    def page(self, cursor=None):
+        queryset, values, reverse = self._page_queryset(cursor)
+        return self._build_page(list(queryset), values, reverse)
+
+    async def apage(self, cursor=None):
+        queryset, values, reverse = self._page_queryset(cursor)
+        rows = [row async for row in queryset]
+        return self._build_page(rows, values, reverse)
+
+    def get_page(self, cursor=None):
+        """Как Paginator.get_page: битый курсор ведёт на первую страницу."""
+        try:
+            return self.page(cursor)
+        except InvalidCursor:
+            return self.page()
+
+    async def aget_page(self, cursor=None):
+        try:
+            return await self.apage(cursor)
+        except InvalidCursor:
+            return await self.apage()
@@ -0,0 +1,90 @@
+import re
+
+from django.db import connection
+from django.db.models import F, Q
+from django.db.models.expressions import RawSQL
+
+FTS_TABLE = 'blog_post_fts'
+
+WORD_RE = re.compile(r'\w+')
+
+
+def fts_available():
+    return connection.vendor == 'sqlite'
+
+
+def fts_query(query):
+    """Превращает пользовательский ввод в безопасный запрос FTS5.
+
+    Каждое слово берётся в кавычки и ищется по префиксу, слова
+    соединяются через AND, поэтому операторы FTS5 из ввода
+    не интерпретируются.
+    """
+    return ' '.join(f'"{word}"*' for word in WORD_RE.findall(query))
+
+
+def index_post(post):
+    if not fts_available():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [post.pk])
+        cursor.execute(
+            f'INSERT INTO {FTS_TABLE} (rowid, title, text) '
+            'VALUES (%s, %s, %s)',
+            [post.pk, post.title, post.text],
+        )
+
+
+def unindex_post(post_id):
+    if not fts_available():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [post_id])
+
+
+def reindex_posts(after_id=None):
+    """Перестраивает индекс после массовой загрузки мимо сигналов.
+
+    С after_id индексирует только публикации с большим id,
+    иначе перестраивает индекс целиком.
+    """
+    if not fts_available():
+        return 0
+    with connection.cursor() as cursor:
+        if after_id is None:
+            cursor.execute(f'DELETE FROM {FTS_TABLE}')
+        cursor.execute(
+            f'INSERT INTO {FTS_TABLE} (rowid, title, text) '
+            'SELECT id, title, text FROM blog_post WHERE id > %s',
+            [after_id or 0],
+        )
+        return cursor.rowcount
+
+
+def search_posts(queryset, query):
+    """Отбирает из queryset публикации по запросу, лучшие — первыми.
+
+    На SQLite используется инвертированный индекс FTS5 и ранжирование
+    bm25, на остальных базах — поиск подстроки в заголовке и тексте.
+    """
+    match = fts_query(query)
+    if not match:
+        return queryset.none()
+    if not fts_available():
+        words = WORD_RE.findall(query)
+        condition = Q()
+        for word in words:
+            condition &= Q(title__icontains=word) | Q(text__icontains=word)
+        return queryset.filter(condition)
+    table = queryset.model._meta.db_table
+    rank = RawSQL(
+        f'SELECT bm25({FTS_TABLE}, 10.0, 1.0) FROM {FTS_TABLE} '
+        f'WHERE {FTS_TABLE} MATCH %s AND rowid = "{table}"."id"',
+        [match],
+    )
+    return queryset.filter(
+        pk__in=RawSQL(
+            f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s',
+            [match],
+        )
+    ).annotate(search_rank=rank).order_by(F('search_rank').asc(), '-pk')
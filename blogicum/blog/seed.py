@@ -0,0 +1,225 @@
+import random
+import time
+from contextlib import contextmanager
+from datetime import timedelta
+from itertools import accumulate, islice
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.db import connection, transaction
+from django.db.models import (CharField, Count, Max, OuterRef, Subquery,
+                              Value)
+from django.db.models.functions import Cast, Coalesce, LPad
+from django.utils import timezone
+
+from .constants import COMMENT_PATH_STEP
+from .loading import batches
+from .models import Category, Comment, Location, Post, User
+from .search import reindex_posts
+
+WORDS = (
+    'город', 'горы', 'море', 'поезд', 'рассвет', 'дорога', 'лес', 'река',
+    'кофе', 'книга', 'велосипед', 'зима', 'лето', 'осень', 'весна', 'музей',
+)
+
+PAST_MINUTES = 2 * 365 * 24 * 60
+
+FUTURE_MINUTES = 30 * 24 * 60
+
+POWER_LAW_ALPHA = 1.2
+
+TEXT_POOL_SIZE = 1000
+
+
+def sentence(rng, words):
+    return ' '.join(rng.choices(WORDS, k=words)).capitalize()
+
+
+def power_law_weights(rng, size):
+    """Накопленные веса с распределением Парето.
+
+    Небольшая доля авторов пишет большую часть постов, а немногие
+    посты собирают большую часть комментариев.
+    """
+    return list(accumulate(
+        rng.paretovariate(POWER_LAW_ALPHA) for _ in range(size)
+    ))
+
+
+def text_pool(rng, min_words, max_words):
+    """Заготовленные тексты: собирать предложение на каждую строку дорого."""
+    return [
+        sentence(rng, rng.randint(min_words, max_words))
+        for _ in range(TEXT_POOL_SIZE)
+    ]
+
+
+def weighted_stream(rng, population, cum_weights, chunk_size=10_000):
+    """Бесконечный поток значений с весами, выбираемых порциями."""
+    while True:
+        yield from rng.choices(population, cum_weights=cum_weights,
+                               k=chunk_size)
+
+
+def bulk_insert(model, objects, batch_size):
+    """bulk_create порциями: в памяти не больше batch_size объектов.
+
+    Сам bulk_create превращает генератор в список целиком,
+    поэтому порции нарезаются до вызова.
+    """
+    inserted = 0
+    for chunk in batches(objects, batch_size):
+        with transaction.atomic():
+            model.objects.bulk_create(chunk)
+        inserted += len(chunk)
+    return inserted
+
+
+def fill_comment_paths():
+    """Пути комментариев, вставленных мимо Comment.save().
+
+    Такие комментарии считаются корневыми: путь — это их id.
+    """
+    return Comment.objects.filter(path='').update(
+        path=LPad(Cast('pk', CharField()), COMMENT_PATH_STEP, Value('0'))
+    )
+
+
+def count_comments():
+    """Post.comment_count для всех публикаций одним UPDATE."""
+    return Post.objects.update(comment_count=Coalesce(
+        Subquery(
+            Comment.objects.filter(post=OuterRef('pk')).values('post')
+            .annotate(total=Count('pk')).values('total')
+        ),
+        0,
+    ))
+
+
+@contextmanager
+def fast_load(models=(Post, Comment)):
+    """Ускоряет массовую вставку, пока данные не видит никто другой.
+
+    Индексы из Meta.indexes удаляются и строятся заново один раз
+    после загрузки, проверка внешних ключей отключается: id связей
+    берутся из уже вставленных строк. Для SQLite на время загрузки
+    выключается ещё и fsync — при сбое недогруженную базу проще
+    пересоздать.
+    """
+    sqlite = connection.vendor == 'sqlite'
+    if sqlite:
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA synchronous = OFF')
+    with connection.schema_editor() as editor:
+        for model in models:
+            for index in model._meta.indexes:
+                editor.remove_index(model, index)
+    try:
+        with connection.constraint_checks_disabled():
+            yield
+    finally:
+        with connection.schema_editor() as editor:
+            for model in models:
+                for index in model._meta.indexes:
+                    editor.add_index(model, index)
+        if sqlite:
+            with connection.cursor() as cursor:
+                cursor.execute('PRAGMA synchronous = {}'.format(
+                    settings.SQLITE_PRAGMAS.get('synchronous', 'FULL')
+                ))
+
+
+def seed(users=20, categories=10, locations=10, posts=500, comments=2000,
+         batch_size=1000, random_seed=0, future_share=0.0, hidden_share=0.0,
+         on_step=None):
+    """Заполняет базу синтетическими данными через bulk_create.
+
+    Доля future_share постов отложена на будущее, hidden_share снята
+    с публикации; комментарии достаются только видимым постам.
+    Сигналы при этом не срабатывают, поэтому пути комментариев,
+    счётчики и поисковый индекс достраиваются отдельными запросами.
+    on_step(название, строк, секунд) вызывается после каждого шага.
+    """
+    rng = random.Random(random_seed)
+    now = timezone.now()
+
+    def step(label, load):
+        start = time.perf_counter()
+        rows = load()
+        if on_step is not None:
+            on_step(label, rows, time.perf_counter() - start)
+
+    def post_dates():
+        for _ in range(posts):
+            if rng.random() < future_share:
+                yield now + timedelta(minutes=rng.randint(1, FUTURE_MINUTES))
+            else:
+                yield now - timedelta(minutes=rng.randint(1, PAST_MINUTES))
+
+    password = make_password('load-test')
+    offset = User.objects.count()
+    step('пользователи', lambda: bulk_insert(User, (
+        User(username=f'reader{offset + index}', password=password)
+        for index in range(users)
+    ), batch_size))
+    offset = Category.objects.count()
+    step('категории', lambda: bulk_insert(Category, (
+        Category(
+            title=f'Категория {offset + index}',
+            description=sentence(rng, 12),
+            slug=f'category-{offset + index}',
+        )
+        for index in range(categories)
+    ), batch_size))
+    step('места', lambda: bulk_insert(Location, (
+        Location(name=f'Место {index}') for index in range(locations)
+    ), batch_size))
+
+    last_post_id = Post.objects.aggregate(last=Max('pk'))['last'] or 0
+    user_ids = list(User.objects.values_list('pk', flat=True))
+    author_weights = power_law_weights(rng, len(user_ids))
+    authors = weighted_stream(rng, user_ids, author_weights)
+    category_ids = list(Category.objects.values_list('pk', flat=True))
+    location_ids = list(Location.objects.values_list('pk', flat=True))
+    titles, texts = text_pool(rng, 2, 6), text_pool(rng, 20, 120)
+    step('публикации', lambda: bulk_insert(Post, (
+        Post(
+            title=rng.choice(titles),
+            text=rng.choice(texts),
+            pub_date=pub_date,
+            author_id=author_id,
+            category_id=rng.choice(category_ids),
+            location_id=rng.choice(location_ids),
+            is_published=is_published,
+            is_visible=is_published and pub_date <= now,
+        )
+        for pub_date, author_id, is_published in (
+            (pub_date, author_id, rng.random() >= hidden_share)
+            for pub_date, author_id in zip(post_dates(), authors)
+        )
+    ), batch_size))
+
+    post_ids = list(
+        Post.objects.filter(is_visible=True).values_list('pk', flat=True)
+    )
+    commented = weighted_stream(
+        rng, post_ids, power_law_weights(rng, len(post_ids))
+    )
+    texts = text_pool(rng, 3, 40)
+    step('комментарии', lambda: bulk_insert(Comment, (
+        Comment(text=rng.choice(texts), post_id=post_id, author_id=author_id)
+        for post_id, author_id in islice(
+            zip(commented, authors), comments if post_ids else 0
+        )
+    ), batch_size))
+
+    step('пути комментариев', fill_comment_paths)
+    step('счётчики комментариев', count_comments)
+    step('поисковый индекс', lambda: reindex_posts(last_post_id))
+    return {
+        'users': users,
+        'categories': categories,
+        'locations': locations,
+        'posts': posts,
+        'comments': comments if post_ids else 0,
+    }
@@ -0,0 +1,111 @@
+from django.db.models import Q
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .cache import (FEED_TAG, SITE_TAG, invalidate_post, invalidate_post_card,
+                    invalidate_tags, post_tags)
+from .models import Category, Comment, Location, Post, User
+from .search import index_post, unindex_post
+from .thumbnails import generate_thumbnails
+
+USER_PAGE_FIELDS = ('username', 'first_name', 'last_name', 'is_active')
+
+
+@receiver(pre_save, sender=Post)
+def remember_previous_state(sender, instance, **kwargs):
+    """Запоминает прежние категорию и изображение поста."""
+    instance._old_category_id, instance._old_image = Post.objects.filter(
+        pk=instance.pk
+    ).values_list('category_id', 'image').first() or (None, None)
+
+
+@receiver((post_save, post_delete), sender=Post)
+def post_changed(sender, instance, **kwargs):
+    invalidate_post(
+        instance, f'category:{getattr(instance, "_old_category_id", None)}'
+    )
+
+
+@receiver(post_save, sender=Post)
+def post_saved(sender, instance, update_fields=None, raw=False, **kwargs):
+    if update_fields is None or {'title', 'text'} & set(update_fields):
+        index_post(instance)
+    if raw:
+        return
+    if instance.image and instance.image.name != instance._old_image:
+        # post_changed уже сбросил карточку, но её могли успеть
+        # отрисовать и закэшировать без srcset, пока миниатюр не было.
+        if generate_thumbnails(instance.image):
+            invalidate_post_card(instance.pk)
+            invalidate_tags(*post_tags(instance))
+
+
+@receiver(post_delete, sender=Post)
+def post_deleted(sender, instance, **kwargs):
+    unindex_post(instance.pk)
+
+
+@receiver(post_save, sender=Comment)
+def comment_saved(sender, instance, created, **kwargs):
+    """Правка комментария меняет updated_at поста для ETag/Last-Modified."""
+    if not created:
+        Post.objects.filter(pk=instance.post_id).update(
+            updated_at=timezone.now()
+        )
+
+
+@receiver((post_save, post_delete), sender=Comment)
+def comment_changed(sender, instance, **kwargs):
+    invalidate_post_card(instance.post_id)
+    post = Post.objects.filter(pk=instance.post_id).first()
+    if post is not None:
+        invalidate_tags(*post_tags(post))
+
+
+@receiver((post_save, post_delete), sender=Category)
+@receiver((post_save, post_delete), sender=Location)
+def site_changed(sender, **kwargs):
+    invalidate_tags(SITE_TAG)
+
+
+@receiver(pre_save, sender=User)
+def remember_user_names(sender, instance, update_fields=None, **kwargs):
+    """Запоминает прежние поля пользователя, которые видны на страницах."""
+    instance._old_names = None
+    if instance.pk is None or (
+        update_fields is not None
+        and not set(update_fields) & set(USER_PAGE_FIELDS)
+    ):
+        return
+    instance._old_names = User.objects.filter(pk=instance.pk).values_list(
+        *USER_PAGE_FIELDS
+    ).first()
+
+
+@receiver(post_save, sender=User)
+def user_changed(sender, instance, created, **kwargs):
+    """Смена имени или блокировка сбрасывает только страницы с постами
+    и комментариями пользователя; вход, пароль и почта кэш не трогают.
+    """
+    old_names = getattr(instance, '_old_names', None)
+    if created or old_names is None or old_names == tuple(
+        getattr(instance, field) for field in USER_PAGE_FIELDS
+    ):
+        return
+    posts = Post.objects.filter(
+        Q(author=instance) | Q(comments__author=instance)
+    ).values_list('pk', 'category_id', 'author_id').distinct()
+    tags = {f'user:{instance.pk}'}
+    for post_id, category_id, author_id in posts:
+        tags.update((
+            FEED_TAG,
+            f'post:{post_id}',
+            f'category:{category_id}',
+            f'user:{author_id}',
+        ))
+    invalidate_tags(*tags)
+    # ETag страниц строится по updated_at постов.
+    Post.objects.filter(
+        pk__in=[post_id for post_id, _, _ in posts]
+    ).update(updated_at=timezone.now())
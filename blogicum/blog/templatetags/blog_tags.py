@@ -0,0 +1,35 @@
+from django import template
+from django.utils.html import format_html
+from django.utils.safestring import mark_safe
+
+from blog.cache import render_post_cards
+from blog.constants import CARD_IMAGE_SIZES, CARD_IMAGE_WIDTH
+from blog.thumbnails import thumbnail_srcset
+
+register = template.Library()
+
+
+@register.simple_tag
+def post_cards(posts):
+    """Карточки публикаций страницы из кэша фрагментов."""
+    return [mark_safe(html) for html in render_post_cards(posts)]
+
+
+@register.simple_tag
+def responsive_image(image, css_class=''):
+    """<img> с миниатюрами и оригиналом в srcset и ленивой загрузкой."""
+    srcset = thumbnail_srcset(image)
+    if len(srcset) < 2:
+        return format_html(
+            '<img class="{}" src="{}" loading="lazy" alt="">',
+            css_class, image.url
+        )
+    fitting = [url for url, width in srcset if width <= CARD_IMAGE_WIDTH]
+    return format_html(
+        '<img class="{}" src="{}" srcset="{}" sizes="{}" loading="lazy"'
+        ' alt="">',
+        css_class,
+        fitting[-1] if fitting else srcset[0][0],
+        ', '.join(f'{url} {width}w' for url, width in srcset),
+        CARD_IMAGE_SIZES,
+    )
@@ -0,0 +1,59 @@
+from io import BytesIO
+from pathlib import PurePosixPath
+
+from django.core.files.base import ContentFile
+from PIL import Image, ImageOps
+
+from .constants import THUMBNAIL_DIR, THUMBNAIL_WIDTHS
+
+
+def thumbnail_name(image_name, width):
+    return f'{THUMBNAIL_DIR}/{PurePosixPath(image_name).name}.{width}w.jpg'
+
+
+def generate_thumbnails(image, force=False):
+    """Сохраняет JPEG-миниатюры изображения всех ширин из THUMBNAIL_WIDTHS.
+
+    Ширины больше исходной пропускаются: увеличивать картинку
+    смысла нет. Возвращает число созданных файлов.
+    """
+    storage = image.storage
+    with image.open('rb'):
+        source = ImageOps.exif_transpose(Image.open(image))
+        source = source.convert('RGB')
+    created = 0
+    for width in THUMBNAIL_WIDTHS:
+        if width >= source.width:
+            continue
+        name = thumbnail_name(image.name, width)
+        if storage.exists(name):
+            if not force:
+                continue
+            storage.delete(name)
+        thumbnail = source.copy()
+        thumbnail.thumbnail((width, source.height), Image.Resampling.LANCZOS)
+        buffer = BytesIO()
+        thumbnail.save(buffer, 'JPEG', quality=85, optimize=True)
+        storage.save(name, ContentFile(buffer.getvalue()))
+        created += 1
+    return created
+
+
+def thumbnail_srcset(image):
+    """Пары (url, ширина): созданные миниатюры и последним — оригинал.
+
+    Миниатюры делаются только уже исходной картинки, так что оригинал
+    всегда самый широкий кандидат.
+    """
+    srcset = []
+    for width in THUMBNAIL_WIDTHS:
+        name = thumbnail_name(image.name, width)
+        if image.storage.exists(name):
+            srcset.append((image.storage.url(name), width))
+    try:
+        width = image.width
+    except OSError:
+        width = None
+    if width:
+        srcset.append((image.url, width))
+    return srcset
@@ -1,6 +1,6 @@
 from django.urls import path
 
-from . import views
+from . import api, async_views, feeds, views
 
 app_name = 'blog'
 
@@ -11,6 +11,71 @@ urlpatterns = [
         views.CategoryPostsListView.as_view(),
         name='category_posts'
     ),
+    path('search/', views.PostSearchView.as_view(), name='search'),
+    path('feed/', feeds.LatestPostsFeed(), name='feed'),
+    path('feed/atom/', feeds.LatestPostsAtomFeed(), name='feed_atom'),
+    path(
+        'category/<slug:category_slug>/feed/',
+        feeds.CategoryFeed(),
+        name='category_feed'
+    ),
+    path(
+        'category/<slug:category_slug>/feed/atom/',
+        feeds.CategoryAtomFeed(),
+        name='category_feed_atom'
+    ),
+    path(
+        'profile/<str:username>/feed/',
+        feeds.ProfileFeed(),
+        name='profile_feed'
+    ),
+    path(
+        'profile/<str:username>/feed/atom/',
+        feeds.ProfileAtomFeed(),
+        name='profile_feed_atom'
+    ),
+    path('api/posts/', api.PostListApiView.as_view(), name='api_posts'),
+    path(
+        'api/posts/<int:post_id>/',
+        api.PostApiView.as_view(),
+        name='api_post'
+    ),
+    path(
+        'api/posts/<int:post_id>/comments/',
+        api.CommentListApiView.as_view(),
+        name='api_post_comments'
+    ),
+    path(
+        'api/categories/',
+        api.CategoryListApiView.as_view(),
+        name='api_categories'
+    ),
+    path(
+        'api/profiles/<str:username>/',
+        api.ProfileApiView.as_view(),
+        name='api_profile'
+    ),
+    path('export/<str:kind>/', views.ExportView.as_view(), name='export'),
+    path(
+        'async/',
+        async_views.AsyncHomePageView.as_view(),
+        name='async_index'
+    ),
+    path(
+        'async/category/<slug:category_slug>/',
+        async_views.AsyncCategoryPostsView.as_view(),
+        name='async_category_posts'
+    ),
+    path(
+        'async/profile/<str:username>/',
+        async_views.AsyncProfileView.as_view(),
+        name='async_profile'
+    ),
+    path(
+        'async/posts/<int:post_id>/',
+        async_views.AsyncPostDetailView.as_view(),
+        name='async_post_detail'
+    ),
     path(
         'auth/registration/',
         views.RegisterCreationView.as_view(),
@@ -41,6 +106,11 @@ urlpatterns = [
         views.PostDetailView.as_view(),
         name='post_detail'
     ),
+    path(
+        'posts/<int:post_id>/comments/',
+        views.PostCommentsView.as_view(),
+        name='post_comments'
+    ),
     path(
         'posts/<int:post_id>/delete/',
         views.PostDeleteView.as_view(),
@@ -1,11 +1,30 @@
-from django.core.paginator import Paginator
-
-from .constants import POST_LIMIT_ON_PAGE
+from .constants import COMMENT_LIMIT_ON_PAGE, POST_LIMIT_ON_PAGE
+from .paginators import CachedCountPaginator, CursorPaginator
 
 
 def paginate_page(request, post_list, post_per_page=POST_LIMIT_ON_PAGE):
     """Функция для пагинации страниц"""
-    paginator = Paginator(post_list, post_per_page)
+    paginator = CachedCountPaginator(post_list, post_per_page)
     page_number = request.GET.get('page')
     page_obj = paginator.get_page(page_number)
     return page_obj
+
+
+def comment_paginator(post, per_page=COMMENT_LIMIT_ON_PAGE):
+    """Курсорный пагинатор комментариев поста в порядке обхода веток.
+
+    Ключ — материализованный путь: корни идут по id, то есть по времени,
+    а ответы сразу за своим родителем.
+    """
+    return CursorPaginator(
+        post.comments.select_related('author'),
+        per_page,
+        ordering=('path',),
+    )
+
+
+def paginate_comments(request, post, per_page=COMMENT_LIMIT_ON_PAGE):
+    """Порция комментариев поста по курсору из запроса."""
+    return comment_paginator(post, per_page).get_page(
+        request.GET.get('cursor')
+    )
@@ -1,99 +1,163 @@
 from django.contrib.auth.forms import UserCreationForm
-from django.contrib.auth.mixins import LoginRequiredMixin
+from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
 from django.contrib.auth.models import User
 from django.contrib.auth.views import LogoutView
-from django.db.models import Count, Q
+from django.db import transaction
+from django.db.models import F
+from django.db.models.functions import Greatest
+from django.http import Http404, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 from django.urls import reverse_lazy
 from django.utils import timezone
+from django.utils.http import urlencode
+from django.views import View
 from django.views.generic import DeleteView, DetailView, ListView, UpdateView
 from django.views.generic.edit import CreateView
 
+from .cache import FEED_TAG
 from .constants import POST_LIMIT_ON_PAGE
-from .custom_mixins import CustomAuthorMixin
-from .forms import CommentForm, ProfileEditForm
+from .custom_mixins import (AnonymousPageCacheMixin, ConditionalGetMixin,
+                            CursorPaginationMixin, CustomAuthorMixin,
+                            PageValidatorsMixin, ReplicaReadMixin)
+from .export import EXPORTS, FORMATS, export_lines
+from .forms import CommentForm, ProfileEditForm, ReplyForm
 from .models import Category, Comment, Post
-from .utils import paginate_page
-
-
-class HomePageListView(ListView):
+from .paginators import CachedCountPaginator
+from .search import search_posts
+from .utils import paginate_comments, paginate_page
+
+
+class HomePageListView(
+    ReplicaReadMixin,
+    AnonymousPageCacheMixin,
+    PageValidatorsMixin,
+    CursorPaginationMixin,
+    ListView
+):
     """Главная страница с лентой постов, отсортированная по дате публикации."""
 
+    query_budget = 4
     model = Post
     paginate_by = POST_LIMIT_ON_PAGE
     template_name = 'blog/index.html'
 
     def get_queryset(self):
-        queryset = super().get_queryset()
-        return queryset.filter(
-            is_published=True,
-            category__is_published=True,
-            pub_date__lte=timezone.now()
-        ).annotate(comment_count=Count('comments')).order_by('-pub_date')
+        return Post.objects.published().for_feed().order_by('-pub_date')
+
+    def get_page_cache_tags(self):
+        return [FEED_TAG]
 
 
-class CategoryPostsListView(ListView):
+class CategoryPostsListView(
+    ReplicaReadMixin,
+    AnonymousPageCacheMixin,
+    PageValidatorsMixin,
+    CursorPaginationMixin,
+    ListView
+):
     """Страница с постами отсортированными по категории."""
 
+    query_budget = 5
     model = Post
     template_name = 'blog/category.html'
     paginate_by = POST_LIMIT_ON_PAGE
 
     def get_queryset(self):
-        self.category = get_object_or_404(
-            Category,
-            slug=self.kwargs['category_slug'],
-            is_published=True
-        )
-        return self.category.posts.filter(
-            is_published=True,
-            pub_date__lte=timezone.now()
-        )
+        if not hasattr(self, 'category'):
+            self.category = get_object_or_404(
+                Category,
+                slug=self.kwargs['category_slug'],
+                is_published=True
+            )
+        return Post.objects.published().filter(
+            category=self.category
+        ).for_feed()
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['category'] = self.category
         return context
 
+    def get_page_cache_tags(self):
+        return [f'category:{self.category.pk}']
+
+
+class PostSearchView(ListView):
+    """Поиск по заголовкам и текстам опубликованных постов."""
+
+    query_budget = 4
+    model = Post
+    template_name = 'blog/search.html'
+    paginate_by = POST_LIMIT_ON_PAGE
+    paginator_class = CachedCountPaginator
+
+    def get_queryset(self):
+        self.query = self.request.GET.get('q', '').strip()
+        return search_posts(
+            Post.objects.published().for_feed(), self.query
+        )
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['query'] = self.query
+        context['page_query'] = urlencode({'q': self.query}) + '&'
+        return context
+
 
 class RegisterCreationView(CreateView):
+    query_budget = 3
     template_name = 'registration/registration_form.html'
     form_class = UserCreationForm
     success_url = reverse_lazy('blog:index')
 
 
-class ProfileDetailView(DetailView):
+class ProfileDetailView(
+    ReplicaReadMixin, AnonymousPageCacheMixin, ConditionalGetMixin, DetailView
+):
     """Страница профиля пользователя с его постами."""
 
+    query_budget = 6
     template_name = 'blog/profile.html'
-    model = User
+    queryset = User.objects.filter(is_active=True)
     context_object_name = 'profile'
     slug_field = 'username'
     slug_url_kwarg = 'username'
 
+    def reads_own_content(self):
+        return self.request.user.username == self.kwargs['username']
+
+    def get_object(self, queryset=None):
+        if not hasattr(self, '_profile'):
+            self._profile = super().get_object(queryset)
+        return self._profile
+
+    def get_posts(self):
+        return Post.objects.visible_to(self.request.user).filter(
+            author=self.get_object()
+        ).order_by('-pub_date', '-id')
+
+    def get_validators(self):
+        return self.page_validators(paginate_page(
+            self.request, self.get_posts().only(*self.validator_fields)
+        ))
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         user = self.object
-        if self.request.user == user:
-            posts = Post.objects.filter(author=user)
-        else:
-            posts = Post.objects.filter(
-                author=user,
-                is_published=True,
-                category__is_published=True,
-                pub_date__lte=timezone.now()
-            )
-        posts = posts.annotate(
-            comment_count=Count('comments')
-        ).order_by('-pub_date')
-        context['page_obj'] = paginate_page(self.request, posts)
+        context['page_obj'] = paginate_page(
+            self.request, self.get_posts().for_feed()
+        )
         context['can_edit'] = self.request.user == user
         return context
 
+    def get_page_cache_tags(self):
+        return [f'user:{self.get_object().pk}']
+
 
 class ProfileEditView(LoginRequiredMixin, UpdateView):
     """Страница редактирования профиля пользователя."""
 
+    query_budget = 7
     model = User
     form_class = ProfileEditForm
     template_name = 'blog/user.html'
@@ -108,6 +172,7 @@ class ProfileEditView(LoginRequiredMixin, UpdateView):
 
 
 class CustomLogoutView(LogoutView):
+    query_budget = 4
     http_method_names = ['get', 'post', 'options']
 
     def get(self, request, *args, **kwargs):
@@ -117,6 +182,7 @@ class CustomLogoutView(LogoutView):
 class CreatePostView(LoginRequiredMixin, CreateView):
     """Страница для создания поста."""
 
+    query_budget = 10
     model = Post
     template_name = 'blog/create.html'
     fields = [
@@ -132,48 +198,77 @@ class CreatePostView(LoginRequiredMixin, CreateView):
         return super().form_valid(form)
 
 
-class PostDetailView(DetailView):
+class PostDetailView(
+    ReplicaReadMixin, AnonymousPageCacheMixin, ConditionalGetMixin, DetailView
+):
     """Страница детального описания поста,
     с комментариями.
     """
 
+    query_budget = 6
     model = Post
     template_name = 'blog/detail.html'
 
+    def reads_own_content(self):
+        return Post.objects.filter(
+            pk=self.kwargs['post_id'], author=self.request.user
+        ).exists()
+
     def get_object(self):
-        user = self.request.user
-        if user.is_authenticated:
-            condition = (
-                Q(author=self.request.user)
-                | (Q(is_published=True)
-                    & Q(category__is_published=True)
-                    & Q(pub_date__lte=timezone.now()))
-            )
-        else:
-            condition = (
-                Q(is_published=True)
-                & Q(category__is_published=True)
-                & Q(pub_date__lte=timezone.now())
-            )
+        return get_object_or_404(
+            Post.objects.visible_to(self.request.user).for_feed(),
+            pk=self.kwargs['post_id'],
+        )
+
+    def get_validators(self):
         post = get_object_or_404(
-            Post.objects.filter(condition),
+            Post.objects.visible_to(self.request.user).values(
+                'updated_at', 'comment_count'
+            ),
             pk=self.kwargs['post_id'],
         )
-        return post
+        return [post['updated_at'], post['comment_count']], post['updated_at']
+
+    def context_validators(self, context):
+        post = context['object']
+        return [post.updated_at, post.comment_count], post.updated_at
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         if self.request.user.is_authenticated:
             context['form'] = CommentForm()
-        context['comments'] = (
-            self.object.comments.select_related('author').all()
-        )
+        context['comments'] = paginate_comments(self.request, self.object)
         return context
 
+    def get_page_cache_tags(self):
+        return [f'post:{self.kwargs["post_id"]}']
+
+
+class PostCommentsView(AnonymousPageCacheMixin, DetailView):
+    """Следующая порция комментариев поста для подгрузки на его странице."""
+
+    query_budget = 4
+    model = Post
+    template_name = 'includes/comments.html'
+    pk_url_kwarg = 'post_id'
+
+    def get_queryset(self):
+        return Post.objects.visible_to(self.request.user).only('pk')
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['comments'] = paginate_comments(self.request, self.object)
+        context['fragment'] = True
+        return context
+
+    def get_page_cache_tags(self):
+        return [f'post:{self.object.pk}']
+
 
 class PostEditView(CustomAuthorMixin, UpdateView):
     """Страница редактирования поста."""
 
+    query_budget = 13
     model = Post
     fields = ['title', 'text', 'category', 'location', 'image', 'pub_date']
     template_name = 'blog/create.html'
@@ -188,6 +283,7 @@ class PostEditView(CustomAuthorMixin, UpdateView):
 class PostDeleteView(CustomAuthorMixin, DeleteView):
     """Страница удаления поста."""
 
+    query_budget = 12
     model = Post
     template_name = 'blog/create.html'
     pk_url_kwarg = 'post_id'
@@ -203,14 +299,37 @@ class CommentCreateView(LoginRequiredMixin, CreateView):
     с проверкой авторизации.
     """
 
+    query_budget = 13
     model = Comment
     form_class = CommentForm
     template_name = 'blog/comment.html'
 
+    def get_form_class(self):
+        if 'parent' in self.request.POST:
+            return ReplyForm
+        return super().get_form_class()
+
+    def get_form(self, form_class=None):
+        form = super().get_form(form_class)
+        if 'parent' in form.fields:
+            form.fields['parent'].queryset = Comment.objects.filter(
+                post_id=self.kwargs['post_id']
+            )
+        return form
+
     def form_valid(self, form):
         form.instance.author = self.request.user
-        form.instance.post = get_object_or_404(Post, pk=self.kwargs['post_id'])
-        return super().form_valid(form)
+        form.instance.post = get_object_or_404(
+            Post.objects.visible_to(self.request.user),
+            pk=self.kwargs['post_id'],
+        )
+        with transaction.atomic():
+            response = super().form_valid(form)
+            Post.objects.filter(pk=form.instance.post_id).update(
+                comment_count=F('comment_count') + 1,
+                updated_at=timezone.now(),
+            )
+        return response
 
     def get_success_url(self):
         return reverse_lazy(
@@ -223,6 +342,7 @@ class CommentEditView(CustomAuthorMixin, UpdateView):
     с проверкой на авторство.
     """
 
+    query_budget = 8
     model = Comment
     form_class = CommentForm
     template_name = 'blog/comment.html'
@@ -244,11 +364,46 @@ class CommentEditView(CustomAuthorMixin, UpdateView):
 class CommentDeleteView(CustomAuthorMixin, DeleteView):
     """Удаление комментария, с проверкой на авторство."""
 
+    query_budget = 15
     model = Comment
     template_name = 'blog/comment.html'
     pk_url_kwarg = 'comment_id'
 
+    def form_valid(self, form):
+        with transaction.atomic():
+            removed = Comment.objects.thread(self.object).count()
+            response = super().form_valid(form)
+            Post.objects.filter(pk=self.object.post_id).update(
+                comment_count=Greatest(F('comment_count') - removed, 0),
+                updated_at=timezone.now(),
+            )
+        return response
+
     def get_success_url(self):
         return reverse_lazy(
             'blog:post_detail', kwargs={'post_id': self.object.post.pk}
         )
+
+
+class ExportView(UserPassesTestMixin, View):
+    """Потоковая выгрузка публикаций или комментариев для сотрудников.
+
+    Формат задаётся параметром ?format=csv или ?format=jsonl.
+    """
+
+    query_budget = 2
+
+    def test_func(self):
+        return self.request.user.is_staff
+
+    def get(self, request, kind):
+        fmt = request.GET.get('format', 'csv')
+        if kind not in EXPORTS or fmt not in FORMATS:
+            raise Http404
+        response = StreamingHttpResponse(
+            export_lines(kind, fmt), content_type=FORMATS[fmt]
+        )
+        response['Content-Disposition'] = (
+            f'attachment; filename="{kind}.{fmt}"'
+        )
+        return response
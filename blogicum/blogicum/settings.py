@@ -33,13 +33,17 @@ INTERNAL_IPS = [
 ]
 
 MIDDLEWARE = [
+    'core.middleware.ServerTimingMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'core.middleware.QueryBudgetMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'core.middleware.SamplingProfilerMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'core.middleware.ReplicaStickinessMiddleware',
     'debug_toolbar.middleware.DebugToolbarMiddleware',
 
 ]
@@ -49,7 +53,7 @@ ROOT_URLCONF = 'blogicum.urls'
 TEMPLATES_DIR = BASE_DIR / 'templates'
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'BACKEND': 'core.templates.TimedDjangoTemplates',
         'DIRS': [TEMPLATES_DIR],
         'APP_DIRS': True,
         'OPTIONS': {
@@ -70,6 +74,11 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'CONN_MAX_AGE': 60,
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {
+            'transaction_mode': 'IMMEDIATE',
+        },
     }
 }
 
@@ -122,3 +131,52 @@ MEDIA_URL = '/media/'
 EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 
 EMAIL_FILE_PATH = BASE_DIR / 'sent_emails'
+
+PAGINATOR_COUNT_TTL = 60
+
+PAGINATOR_COUNT_THRESHOLD = 10_000
+
+PAGINATOR_LARGE_COUNT_TTL = 60 * 60
+
+POST_CARD_CACHE_TTL = 60 * 60 * 24
+
+PAGE_CACHE_TTL = 60 * 5
+
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': 5000,
+    'mmap_size': 256 * 1024 * 1024,
+    'cache_size': -32 * 1024,
+    'temp_store': 'MEMORY',
+}
+
+DATABASE_ROUTERS = ['core.routers.PrimaryReplicaRouter']
+
+DATABASE_REPLICAS = []
+
+REPLICA_STICKY_COOKIE = 'primary_reads'
+
+REPLICA_STICKY_SECONDS = 10
+
+QUERY_BUDGET_ACTION = 'log' if DEBUG else None
+
+QUERY_BUDGET_DEFAULT = 10
+
+PROFILER_SAMPLE_RATE = 0.01
+
+PROFILER_HEADER = 'X-Profile'
+
+PROFILER_INTERVAL = 0.005
+
+PROFILER_MAX_STACKS = 2000
+
+PROFILER_TTL = 60 * 60 * 24
+
+SERVER_TIMING = True
+
+CACHES = {
+    'default': {
+        'BACKEND': 'core.cache.TimedLocMemCache',
+    },
+}
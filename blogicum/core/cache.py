@@ -0,0 +1,35 @@
+from django.core.cache.backends.locmem import LocMemCache
+
+from .timing import measure
+
+CACHE_METHODS = (
+    'add', 'get', 'set', 'touch', 'delete', 'get_many', 'get_or_set',
+    'has_key', 'incr', 'decr', 'set_many', 'delete_many', 'clear',
+)
+
+
+def _timed(name):
+    def method(self, *args, **kwargs):
+        with measure('cache'):
+            return getattr(super(TimedCacheMixin, self), name)(
+                *args, **kwargs
+            )
+
+    method.__name__ = name
+    return method
+
+
+class TimedCacheMixin:
+    """Относит обращения к кэшу к фазе cache в Server-Timing.
+
+    Подмешивается перед любым бэкендом кэша, например
+    class TimedRedisCache(TimedCacheMixin, RedisCache).
+    """
+
+
+for _name in CACHE_METHODS:
+    setattr(TimedCacheMixin, _name, _timed(_name))
+
+
+class TimedLocMemCache(TimedCacheMixin, LocMemCache):
+    pass
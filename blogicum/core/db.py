@@ -0,0 +1,43 @@
+from contextlib import ExitStack, asynccontextmanager, contextmanager
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import connections
+
+
+def pragma_statements(pragmas):
+    return [f'PRAGMA {name} = {value}' for name, value in pragmas.items()]
+
+
+def apply_sqlite_pragmas(sender, connection, **kwargs):
+    """Настраивает каждое новое соединение с SQLite по SQLITE_PRAGMAS."""
+    if connection.vendor != 'sqlite':
+        return
+    # Напрямую через драйвер: PRAGMA не попадают в execute_wrapper,
+    # журнал запросов и бюджет запросов страницы.
+    for statement in pragma_statements(settings.SQLITE_PRAGMAS):
+        connection.connection.execute(statement)
+
+
+@contextmanager
+def wrap_queries(wrapper):
+    """execute_wrapper сразу на всех соединениях текущего потока."""
+    with ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(wrapper))
+        yield
+
+
+@asynccontextmanager
+async def awrap_queries(wrapper):
+    """wrap_queries для async-кода.
+
+    Соединения привязаны к потоку, а async ORM выполняет запросы
+    в потоке sync_to_async, поэтому обёртки ставятся в нём.
+    """
+    wrapping = wrap_queries(wrapper)
+    await sync_to_async(wrapping.__enter__)()
+    try:
+        yield
+    finally:
+        await sync_to_async(wrapping.__exit__)(None, None, None)
@@ -0,0 +1,191 @@
+import logging
+import random
+import threading
+import time
+
+from asgiref.sync import (iscoroutinefunction, markcoroutinefunction,
+                          sync_to_async)
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.utils.deprecation import MiddlewareMixin
+
+from .db import awrap_queries, wrap_queries
+from .profiler import StackSampler, record_stacks
+from .timing import collect_timings, time_query
+
+logger = logging.getLogger(__name__)
+
+
+class ServerTimingMiddleware:
+    """Заголовок Server-Timing: время запросов к базе, рендеринга
+    шаблонов и обращений к кэшу, а также число запросов и обращений.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.SERVER_TIMING:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        start = time.perf_counter()
+        with collect_timings() as timings, wrap_queries(time_query):
+            response = self.get_response(request)
+        response['Server-Timing'] = timings.header(
+            time.perf_counter() - start
+        )
+        return response
+
+    async def __acall__(self, request):
+        start = time.perf_counter()
+        with collect_timings() as timings:
+            async with awrap_queries(time_query):
+                response = await self.get_response(request)
+        response['Server-Timing'] = timings.header(
+            time.perf_counter() - start
+        )
+        return response
+
+
+class QueryBudgetExceeded(Exception):
+    """Страница сделала больше SQL-запросов, чем разрешает её вид."""
+
+
+class QueryCounter:
+    """execute_wrapper, который только считает запросы."""
+
+    def __init__(self):
+        self.executed = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.executed += 1
+        return execute(sql, params, many, context)
+
+
+def query_budget(request):
+    """Бюджет вида, обработавшего запрос, или QUERY_BUDGET_DEFAULT."""
+    match = getattr(request, 'resolver_match', None)
+    view = match and getattr(match.func, 'view_class', match.func)
+    return getattr(view, 'query_budget', settings.QUERY_BUDGET_DEFAULT)
+
+
+class QueryBudgetMiddleware:
+    """Сверяет число SQL-запросов страницы с query_budget её вида.
+
+    Считаются все запросы за время ответа, включая сессию и
+    пользователя. При превышении пишет предупреждение в журнал
+    или, если QUERY_BUDGET_ACTION = 'raise', падает с ошибкой.
+    Работает и в синхронной, и в асинхронной цепочке.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.QUERY_BUDGET_ACTION:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        counter = QueryCounter()
+        with wrap_queries(counter):
+            response = self.get_response(request)
+        self.check_budget(request, counter.executed)
+        return response
+
+    async def __acall__(self, request):
+        counter = QueryCounter()
+        async with awrap_queries(counter):
+            response = await self.get_response(request)
+        self.check_budget(request, counter.executed)
+        return response
+
+    def check_budget(self, request, executed):
+        budget = query_budget(request)
+        if budget is not None and executed > budget:
+            message = (
+                f'{request.method} {request.path}: {executed} SQL-запросов '
+                f'при бюджете {budget}.'
+            )
+            if settings.QUERY_BUDGET_ACTION == 'raise':
+                raise QueryBudgetExceeded(message)
+            logger.warning(message)
+
+
+class SamplingProfilerMiddleware:
+    """Профилирует долю PROFILER_SAMPLE_RATE запросов и запросы
+    сотрудников с заголовком PROFILER_HEADER.
+
+    Стеки копятся по имени маршрута и видны в админке на
+    странице admin/profiler/. В async-цепочке снимаются стеки
+    и цикла событий, и потока, где async ORM выполняет запросы.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not self.should_profile(request, request.user):
+            return self.get_response(request)
+        with StackSampler(settings.PROFILER_INTERVAL) as sampler:
+            response = self.get_response(request)
+        if request.resolver_match is not None:
+            record_stacks(request.resolver_match.view_name, sampler.stacks)
+        return response
+
+    async def __acall__(self, request):
+        if not self.should_profile(request, await request.auser()):
+            return await self.get_response(request)
+        thread_ids = {
+            threading.get_ident(),
+            await sync_to_async(threading.get_ident)(),
+        }
+        with StackSampler(settings.PROFILER_INTERVAL, thread_ids) as sampler:
+            response = await self.get_response(request)
+        if request.resolver_match is not None:
+            await sync_to_async(record_stacks)(
+                request.resolver_match.view_name, sampler.stacks
+            )
+        return response
+
+    def should_profile(self, request, user):
+        if settings.PROFILER_HEADER in request.headers:
+            return user.is_staff
+        return random.random() < settings.PROFILER_SAMPLE_RATE
+
+
+class ReplicaStickinessMiddleware(MiddlewareMixin):
+    """После запроса, меняющего данные, читаем с основной базы.
+
+    Кука живёт REPLICA_STICKY_SECONDS — дольше, чем отстают реплики.
+    """
+
+    def process_response(self, request, response):
+        if settings.DATABASE_REPLICAS and request.method not in (
+            'GET', 'HEAD', 'OPTIONS', 'TRACE'
+        ):
+            response.set_cookie(
+                settings.REPLICA_STICKY_COOKIE,
+                '1',
+                max_age=settings.REPLICA_STICKY_SECONDS,
+                httponly=True,
+                samesite='Lax',
+            )
+        return response
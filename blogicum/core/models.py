@@ -4,7 +4,7 @@ from django.db import models
 class CreatedModel(models.Model):
     """Абстрактная модель. Добавляет флаг is_published.
 
-    И дату создания created_at.
+    И даты создания created_at и изменения updated_at.
     """
 
     is_published = models.BooleanField(
@@ -15,6 +15,9 @@ class CreatedModel(models.Model):
     created_at = models.DateTimeField(
         auto_now_add=True, verbose_name='Добавлено'
     )
+    updated_at = models.DateTimeField(
+        auto_now=True, verbose_name='Изменено'
+    )
 
     class Meta:
         abstract = True
@@ -0,0 +1,108 @@
+import sys
+import threading
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import cache
+
+PROFILE_NAMES = 'profiler:names'
+
+
+def _profile_key(view_name):
+    return f'profiler:{view_name}'
+
+
+def frame_label(frame):
+    code = frame.f_code
+    module = frame.f_globals.get('__name__', '?')
+    return f'{module}:{getattr(code, "co_qualname", code.co_name)}'
+
+
+def collapse(frame):
+    """Стек в формате collapsed: от корня к листу через «;»."""
+    labels = []
+    while frame is not None:
+        labels.append(frame_label(frame))
+        frame = frame.f_back
+    return ';'.join(reversed(labels))
+
+
+class StackSampler:
+    """Снимает стеки потоков thread_ids каждые interval секунд.
+
+    По умолчанию профилируется текущий поток. Выборка идёт из
+    фонового потока через sys._current_frames(), поэтому
+    профилируемый код не замедляется трассировкой вызовов.
+    """
+
+    def __init__(self, interval, thread_ids=None):
+        self.interval = interval
+        self.stacks = Counter()
+        self._thread_ids = set(thread_ids or {threading.get_ident()})
+        self._stop = threading.Event()
+        self._sampler = threading.Thread(target=self._run, daemon=True)
+
+    def __enter__(self):
+        self._sampler.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        self._sampler.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frames = sys._current_frames()
+            for thread_id in self._thread_ids:
+                frame = frames.get(thread_id)
+                if frame is not None:
+                    self.stacks[collapse(frame)] += 1
+
+
+def record_stacks(view_name, stacks):
+    """Добавляет стеки запроса к накопленным для маршрута.
+
+    Чтение и запись в кэш не атомарны: при гонке двух запросов
+    теряется одна выборка, для профиля это не важно.
+    """
+    key = _profile_key(view_name)
+    requests, profile = cache.get(key, (0, Counter()))
+    profile.update(stacks)
+    if len(profile) > settings.PROFILER_MAX_STACKS:
+        profile = Counter(dict(
+            profile.most_common(settings.PROFILER_MAX_STACKS)
+        ))
+    cache.set(key, (requests + 1, profile), settings.PROFILER_TTL)
+    names = cache.get(PROFILE_NAMES, set())
+    if view_name not in names:
+        cache.set(PROFILE_NAMES, names | {view_name}, timeout=None)
+
+
+def profiles():
+    """Маршруты с числом профилированных запросов и выборок."""
+    names = sorted(cache.get(PROFILE_NAMES, set()))
+    stored = cache.get_many([_profile_key(name) for name in names])
+    result = [
+        (name, *stored[_profile_key(name)])
+        for name in names if _profile_key(name) in stored
+    ]
+    return [
+        {'view_name': name, 'requests': requests,
+         'samples': sum(profile.values())}
+        for name, requests, profile in result
+    ]
+
+
+def collapsed_stacks(view_name):
+    """Профиль маршрута для flamegraph.pl или speedscope, либо None."""
+    stored = cache.get(_profile_key(view_name))
+    if stored is None:
+        return None
+    return ''.join(
+        f'{stack} {count}\n' for stack, count in stored[1].most_common()
+    )
+
+
+def clear_profiles():
+    names = cache.get(PROFILE_NAMES, set())
+    cache.delete_many([PROFILE_NAMES, *map(_profile_key, names)])
@@ -0,0 +1,41 @@
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+
+_read_alias = ContextVar('read_alias', default=None)
+
+
+def prefers_primary(request):
+    """Зритель недавно писал и должен видеть свои изменения."""
+    return settings.REPLICA_STICKY_COOKIE in request.COOKIES
+
+
+@contextmanager
+def read_from_replica():
+    """Чтения внутри блока уходят на случайную реплику."""
+    if not settings.DATABASE_REPLICAS:
+        yield None
+        return
+    alias = random.choice(settings.DATABASE_REPLICAS)
+    token = _read_alias.set(alias)
+    try:
+        yield alias
+    finally:
+        _read_alias.reset(token)
+
+
+class PrimaryReplicaRouter:
+    """Запись всегда в default, чтение — на реплику только внутри
+    read_from_replica(), иначе тоже в default.
+    """
+
+    def db_for_read(self, model, **hints):
+        return _read_alias.get()
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
@@ -0,0 +1,24 @@
+from django.template.backends.django import DjangoTemplates, Template
+
+from .timing import measure
+
+
+class TimedTemplate(Template):
+
+    def render(self, context=None, request=None):
+        with measure('tpl'):
+            return super().render(context, request)
+
+
+class TimedDjangoTemplates(DjangoTemplates):
+    """Шаблоны Django, время рендеринга которых идёт в Server-Timing."""
+
+    def from_string(self, template_code):
+        return TimedTemplate(
+            super().from_string(template_code).template, self
+        )
+
+    def get_template(self, template_name):
+        return TimedTemplate(
+            super().get_template(template_name).template, self
+        )
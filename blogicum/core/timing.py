@@ -0,0 +1,65 @@
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+PHASES = ('db', 'tpl', 'cache')
+
+_timings = ContextVar('server_timing', default=None)
+
+
+class Timings:
+    """Длительности и число вызовов по фазам одного запроса."""
+
+    def __init__(self):
+        self.durations = defaultdict(float)
+        self.counts = Counter()
+        self.active = set()
+
+    def header(self, total):
+        """Значение заголовка Server-Timing, длительности в мс."""
+        metrics = []
+        for phase in PHASES:
+            metric = f'{phase};dur={self.durations[phase] * 1000:.1f}'
+            if phase != 'tpl':
+                metric += f';desc="{self.counts[phase]}"'
+            metrics.append(metric)
+        metrics.append(f'total;dur={total * 1000:.1f}')
+        return ', '.join(metrics)
+
+
+@contextmanager
+def collect_timings():
+    timings = Timings()
+    token = _timings.set(timings)
+    try:
+        yield timings
+    finally:
+        _timings.reset(token)
+
+
+@contextmanager
+def measure(phase):
+    """Засекает фазу текущего запроса.
+
+    Вложенный вызов той же фазы, например get() внутри get_or_set()
+    или шаблон карточки внутри шаблона ленты, не суммируется дважды.
+    """
+    timings = _timings.get()
+    if timings is None or phase in timings.active:
+        yield
+        return
+    timings.active.add(phase)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.durations[phase] += time.perf_counter() - start
+        timings.counts[phase] += 1
+        timings.active.discard(phase)
+
+
+def time_query(execute, sql, params, many, context):
+    """execute_wrapper, который относит запрос к фазе db."""
+    with measure('db'):
+        return execute(sql, params, many, context)
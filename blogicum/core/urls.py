@@ -0,0 +1,19 @@
+from django.contrib import admin
+from django.urls import path
+
+from . import views
+
+app_name = 'profiler'
+
+urlpatterns = [
+    path(
+        '',
+        admin.site.admin_view(views.profiler_index),
+        name='index'
+    ),
+    path(
+        '<str:view_name>/',
+        admin.site.admin_view(views.profiler_stacks),
+        name='stacks'
+    ),
+]
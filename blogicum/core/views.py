@@ -0,0 +1,25 @@
+from django.contrib import admin
+from django.http import Http404, HttpResponse
+from django.shortcuts import redirect, render
+
+from .profiler import clear_profiles, collapsed_stacks, profiles
+
+
+def profiler_index(request):
+    """Маршруты, по которым накоплены профили; POST их очищает."""
+    if request.method == 'POST':
+        clear_profiles()
+        return redirect('profiler:index')
+    return render(request, 'admin/profiler.html', {
+        **admin.site.each_context(request),
+        'title': 'Профили страниц',
+        'profiles': profiles(),
+    })
+
+
+def profiler_stacks(request, view_name):
+    """Стеки маршрута в формате collapsed, по строке на стек."""
+    stacks = collapsed_stacks(view_name)
+    if stacks is None:
+        raise Http404
+    return HttpResponse(stacks, content_type='text/plain; charset=utf-8')
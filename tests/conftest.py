@@ -10,6 +10,7 @@ from typing import (Any, Iterable, List, NamedTuple, Optional, Tuple, Type,
 import pytest
 from django.apps import apps
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.db.models import Field, Model
 from django.forms import BaseForm
 from django.http import HttpResponse
@@ -32,6 +33,25 @@ def enable_debug_false():
         yield
 
 
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+
+
+@pytest.fixture(autouse=True)
+def raise_over_query_budget(settings):
+    """В тестах превышение query_budget — ошибка, а не запись в журнал."""
+    settings.QUERY_BUDGET_ACTION = "raise"
+
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    """Загруженные в тестах изображения не попадают в рабочий каталог."""
+    settings.MEDIA_ROOT = tmp_path / "media"
+    return settings.MEDIA_ROOT
+
+
 class SafeImportFromContextManager:
     def __init__(
             self,
@@ -87,6 +107,24 @@ pytest_plugins = [
 ]
 
 
+@pytest.fixture
+def assert_query_budget():
+    """Открывает страницу с холодным кэшем; превышение бюджета — провал."""
+    from core.middleware import QueryBudgetExceeded
+
+    def check(client: Client, url: str) -> HttpResponse:
+        cache.clear()
+        try:
+            return client.get(url)
+        except QueryBudgetExceeded as error:
+            raise AssertionError(
+                "Убедитесь, что страница укладывается в `query_budget` "
+                f"своего вида: {error}"
+            ) from None
+
+    return check
+
+
 @pytest.fixture
 def mixer():
     return _mixer
@@ -0,0 +1,107 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def api_posts(mixer, user, published_category, published_location):
+    now = timezone.now()
+    return mixer.cycle(5).blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        location=published_location,
+        is_published=True,
+        pub_date=(now - timedelta(hours=hours) for hours in range(1, 6)),
+    )
+
+
+def test_posts_list_pages_by_cursor(client, api_posts, mixer, user):
+    mixer.blend("blog.Post", is_published=False, author=user,
+                category=api_posts[0].category)
+    ids, url = [], "/api/posts/?limit=2"
+    while url:
+        data = client.get(url).json()
+        assert len(data["results"]) <= 2
+        ids += [post["id"] for post in data["results"]]
+        url = data["next"]
+    assert ids == [post.id for post in api_posts], (
+        "Курсор должен обходить все опубликованные посты, новые первыми."
+    )
+    assert "text" not in data["results"][0], (
+        "В списке постов текст по умолчанию не отдаётся."
+    )
+
+
+def test_sparse_fields(client, api_posts):
+    post = api_posts[0]
+    data = client.get(
+        f"/api/posts/{post.id}/?fields=title,author,location"
+    ).json()
+    assert data == {
+        "title": post.title,
+        "author": post.author.username,
+        "location": post.location.name,
+    }, "Ответ должен содержать только поля из ?fields=."
+
+
+@pytest.mark.parametrize(
+    "url",
+    ["/api/posts/?fields=password", "/api/posts/?cursor=broken",
+     "/api/posts/?limit=many"],
+)
+def test_bad_params_are_400(client, url):
+    response = client.get(url)
+    assert response.status_code == 400
+    assert "error" in response.json()
+
+
+def test_hidden_post_is_404(client, mixer, user):
+    post = mixer.blend("blog.Post", is_published=False, author=user)
+    assert client.get(f"/api/posts/{post.id}/").status_code == 404
+    assert client.get(
+        f"/api/posts/{post.id}/comments/"
+    ).status_code == 404
+
+
+def test_comments_categories_profile(client, api_posts, mixer):
+    post = api_posts[0]
+    mixer.cycle(3).blend("blog.Comment", post=post)
+    comments = client.get(f"/api/posts/{post.id}/comments/").json()
+    assert [comment["post"] for comment in comments["results"]] == [
+        post.id
+    ] * 3
+    categories = client.get("/api/categories/?fields=slug").json()
+    assert categories["results"] == [{"slug": post.category.slug}]
+    profile = client.get(f"/api/profiles/{post.author.username}/").json()
+    assert profile["username"] == post.author.username
+    assert "password" not in profile
+
+
+def test_api_does_not_build_models(client, api_posts, monkeypatch):
+    from blog.models import Post
+
+    def fail(*args, **kwargs):
+        raise AssertionError("API не должен создавать объекты моделей.")
+
+    monkeypatch.setattr(Post, "from_db", fail)
+    assert client.get("/api/posts/").status_code == 200
+
+
+@pytest.mark.parametrize("url_template", [
+    "/profile/{}/",
+    "/async/profile/{}/",
+    "/profile/{}/feed/",
+    "/api/profiles/{}/",
+])
+def test_inactive_profile_is_404(client, user, url_template):
+    url = url_template.format(user.username)
+    assert client.get(url).status_code == 200
+    user.is_active = False
+    user.save()
+    assert client.get(url).status_code == 404, (
+        f"Профиль отключённого пользователя не должен открываться: {url}."
+    )
@@ -0,0 +1,81 @@
+from io import StringIO
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.core.management import call_command
+from mixer.backend.django import Mixer
+
+pytestmark = [pytest.mark.django_db]
+
+PAGES = [
+    "/",
+    "/?page=2",
+    "/category/{post.category.slug}/",
+    "/profile/{post.author.username}/",
+    "/posts/{post.id}/",
+]
+
+
+@pytest.fixture
+def feed_posts(mixer: Mixer, user, published_category):
+    posts = mixer.cycle(15).blend(
+        "blog.Post", author=user, category=published_category
+    )
+    mixer.cycle(3).blend("blog.Comment", post=posts[0])
+    return posts
+
+
+@pytest.mark.parametrize("url_template", PAGES)
+def test_async_views_render_same_pages(client, feed_posts, url_template):
+    url = url_template.format(post=feed_posts[0])
+    sync_response = client.get(url)
+    async_response = client.get(f"/async{url}")
+    assert async_response.status_code == sync_response.status_code == 200
+    assert async_response.content == sync_response.content, (
+        f"Убедитесь, что асинхронный вариант страницы {url} выводит"
+        " то же, что и синхронный."
+    )
+
+
+def test_async_views_know_logged_in_user(user_client, feed_posts):
+    content = user_client.get(
+        f"/async/posts/{feed_posts[0].id}/"
+    ).content.decode()
+    assert "Оставить комментарий" in content
+
+
+def test_async_views_return_404(client, feed_posts):
+    assert client.get("/async/category/missing/").status_code == 404
+    assert client.get("/async/posts/0/").status_code == 404
+
+
+@pytest.mark.django_db(transaction=True)
+def test_benchmark_views_reports_every_mode():
+    out = StringIO()
+    call_command(
+        "benchmark_views", requests=4, concurrency=[1, 2], stdout=out
+    )
+    rows = [line.split() for line in out.getvalue().splitlines()[1:]]
+    assert [(row[0], row[1]) for row in rows] == [
+        (mode, level)
+        for level in ("1", "2")
+        for mode in ("wsgi", "asgi-sync", "asgi-async")
+    ]
+
+
+def test_async_views_use_async_page_cache(monkeypatch, async_client,
+                                          feed_posts):
+    from blog import cache as page_cache
+
+    def blocking(*args, **kwargs):
+        raise AssertionError(
+            "Async-виды не должны вызывать синхронный кэш страниц."
+        )
+
+    monkeypatch.setattr(page_cache, "get_cached_page", blocking)
+    monkeypatch.setattr(page_cache, "set_cached_page", blocking)
+    first = async_to_sync(async_client.get)("/async/")
+    repeated = async_to_sync(async_client.get)("/async/")
+    assert first["X-Page-Cache"] == "MISS"
+    assert repeated["X-Page-Cache"] == "HIT"
+    assert repeated.content == first.content
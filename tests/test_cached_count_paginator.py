@@ -0,0 +1,76 @@
+import pytest
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from mixer.backend.django import Mixer
+
+pytestmark = [pytest.mark.django_db]
+
+
+def count_queries(client, url):
+    with CaptureQueriesContext(connection) as captured:
+        response = client.get(url)
+    assert response.status_code == 200
+    return response, [
+        q["sql"] for q in captured.captured_queries if "COUNT(*)" in q["sql"]
+    ]
+
+
+def test_count_is_cached_and_invalidated(
+        mixer: Mixer, another_user_client, user,
+        many_posts_with_published_locations):
+    url = f"/profile/{user.username}/"
+    response, counts = count_queries(another_user_client, url)
+    assert counts and response.context["page_obj"].paginator.count == 20
+
+    _, counts = count_queries(another_user_client, url)
+    assert not counts, (
+        "Убедитесь, что количество публикаций берётся из кэша."
+    )
+
+    mixer.blend(
+        "blog.Post",
+        author=user,
+        category=many_posts_with_published_locations[0].category,
+    )
+    response, counts = count_queries(another_user_client, url)
+    assert counts and response.context["page_obj"].paginator.count == 21, (
+        "Убедитесь, что кэш количества сбрасывается при сохранении поста."
+    )
+
+
+@override_settings(PAGINATOR_COUNT_THRESHOLD=5)
+def test_large_filtered_count_is_exact(
+        mixer: Mixer, client, user, another_user, published_category,
+        many_posts_with_published_locations):
+    mixer.cycle(30).blend(
+        "blog.Post", author=another_user, category=published_category
+    )
+    url = f"/profile/{user.username}/"
+    response, counts = count_queries(client, url)
+    assert counts and response.context["page_obj"].paginator.count == 20, (
+        "Количество публикаций выше порога должно быть настоящим "
+        "количеством строк выборки, а не оценкой по id."
+    )
+    assert client.get(f"{url}?page=2").context["page_obj"], (
+        "Последняя страница большого списка не должна быть пустой."
+    )
+
+    mixer.blend("blog.Post", author=user, category=published_category)
+    response, counts = count_queries(client, url)
+    assert not counts, (
+        "Большое количество не должно пересчитываться после каждой записи."
+    )
+    assert response.context["page_obj"].paginator.count == 20
+
+
+def test_page_range_is_elided(mixer: Mixer, client, user, published_category):
+    mixer.cycle(150).blend(
+        "blog.Post", author=user, category=published_category
+    )
+    response = client.get(f"/profile/{user.username}/?page=8")
+    content = response.content.decode("utf-8")
+    assert "?page=15" in content and "…" in content
+    assert "?page=3\"" not in content, (
+        "Убедитесь, что пагинатор выводит сокращённый список страниц."
+    )
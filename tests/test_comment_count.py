@@ -0,0 +1,77 @@
+import pytest
+from django.core.management import call_command
+from mixer.backend.django import Mixer
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_comment_views_keep_counter(
+        user_client, post_with_published_location):
+    post = post_with_published_location
+    for text in ("Первый", "Второй"):
+        user_client.post(f"/posts/{post.id}/comment/", data={"text": text})
+    post.refresh_from_db()
+    assert post.comment_count == 2, (
+        "Убедитесь, что при создании комментария увеличивается"
+        " `Post.comment_count`."
+    )
+
+    comment = post.comments.first()
+    user_client.post(f"/posts/{post.id}/delete_comment/{comment.id}/")
+    post.refresh_from_db()
+    assert post.comment_count == 1, (
+        "Убедитесь, что при удалении комментария уменьшается"
+        " `Post.comment_count`."
+    )
+
+
+def test_delete_with_drifted_counter_still_touches_post(
+        mixer: Mixer, user_client, post_with_published_location):
+    post = post_with_published_location
+    comment = mixer.blend("blog.Comment", post=post, author=post.author)
+    type(post).objects.filter(pk=post.pk).update(comment_count=0)
+    post.refresh_from_db()
+    updated_at = post.updated_at
+
+    user_client.post(f"/posts/{post.id}/delete_comment/{comment.id}/")
+    post.refresh_from_db()
+    assert post.comment_count == 0, (
+        "Убедитесь, что `Post.comment_count` не уходит ниже нуля."
+    )
+    assert post.updated_at > updated_at, (
+        "Убедитесь, что удаление комментария обновляет `updated_at` поста,"
+        " даже если счётчик разошёлся с числом комментариев."
+    )
+
+
+def test_comment_on_hidden_post_is_rejected(
+        user_client, another_user_client, post_with_published_location):
+    post = post_with_published_location
+    post.is_published = False
+    post.save()
+    response = another_user_client.post(
+        f"/posts/{post.id}/comment/", data={"text": "Чужой"}
+    )
+    assert response.status_code == 404, (
+        "Убедитесь, что нельзя комментировать пост, который не виден"
+        " пользователю."
+    )
+    user_client.post(f"/posts/{post.id}/comment/", data={"text": "Свой"})
+    post.refresh_from_db()
+    assert list(post.comments.values_list("text", flat=True)) == ["Свой"]
+    assert post.comment_count == 1
+
+
+def test_recount_comments_fixes_drift(
+        mixer: Mixer, post_with_published_location, another_category):
+    post = post_with_published_location
+    empty_post = mixer.blend("blog.Post", category=another_category)
+    mixer.cycle(3).blend("blog.Comment", post=post)
+    type(post).objects.filter(pk=post.pk).update(comment_count=42)
+    type(post).objects.filter(pk=empty_post.pk).update(comment_count=7)
+
+    call_command("recount_comments", chunk_size=1)
+
+    post.refresh_from_db()
+    empty_post.refresh_from_db()
+    assert (post.comment_count, empty_post.comment_count) == (3, 0)
@@ -0,0 +1,49 @@
+import re
+
+import pytest
+from mixer.backend.django import Mixer
+
+from blog.constants import COMMENT_LIMIT_ON_PAGE
+
+pytestmark = [pytest.mark.django_db]
+
+COMMENT_ANCHOR = re.compile(r'name="comment_(\d+)"')
+MORE_LINK = re.compile(r'href="([^"]+)" data-comments-more')
+
+
+def test_comments_are_loaded_in_batches(
+        mixer: Mixer, user_client, post_with_published_location):
+    post = post_with_published_location
+    total = COMMENT_LIMIT_ON_PAGE + 5
+    comments = mixer.cycle(total).blend("blog.Comment", post=post)
+    type(post).objects.filter(pk=post.pk).update(comment_count=total)
+
+    content = user_client.get(f"/posts/{post.id}/").content.decode()
+    assert f"Комментарии ({total})" in content, (
+        "Убедитесь, что на странице поста выводится общее число"
+        " комментариев."
+    )
+    shown = COMMENT_ANCHOR.findall(content)
+    assert len(shown) == COMMENT_LIMIT_ON_PAGE, (
+        "Убедитесь, что на странице поста выводится только первая"
+        " порция комментариев."
+    )
+
+    more = MORE_LINK.search(content).group(1).replace("&amp;", "&")
+    fragment = user_client.get(more).content.decode()
+    assert "Оставить комментарий" not in fragment
+    assert not MORE_LINK.search(fragment)
+    shown += COMMENT_ANCHOR.findall(fragment)
+    assert shown == [str(comment.id) for comment in comments], (
+        "Убедитесь, что порции комментариев идут по порядку"
+        " без пропусков и повторов."
+    )
+
+
+def test_comments_fragment_hides_unpublished_post(
+        client, post_with_published_location):
+    post = post_with_published_location
+    post.is_published = False
+    post.save()
+    response = client.get(f"/posts/{post.id}/comments/")
+    assert response.status_code == 404
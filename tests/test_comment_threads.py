@@ -0,0 +1,82 @@
+import re
+
+import pytest
+from django.db import connection
+
+from blog.constants import COMMENT_MAX_DEPTH
+from blog.models import Comment
+
+pytestmark = [pytest.mark.django_db]
+
+COMMENT_ANCHOR = re.compile(r'name="comment_(\d+)"')
+
+
+def reply(client, post, text, parent=None):
+    data = {"text": text}
+    if parent is not None:
+        data["parent"] = parent.id
+    client.post(f"/posts/{post.id}/comment/", data=data)
+    return Comment.objects.get(text=text)
+
+
+def test_replies_follow_their_parent(
+        user_client, post_with_published_location):
+    post = post_with_published_location
+    first = reply(user_client, post, "Первый")
+    second = reply(user_client, post, "Второй")
+    answer = reply(user_client, post, "Ответ", parent=first)
+    nested = reply(user_client, post, "Ответ на ответ", parent=answer)
+
+    assert (answer.parent, nested.depth) == (first, 2)
+    content = user_client.get(f"/posts/{post.id}/").content.decode()
+    assert COMMENT_ANCHOR.findall(content) == [
+        str(comment.id) for comment in (first, answer, nested, second)
+    ], "Убедитесь, что ответы выводятся сразу под своим комментарием."
+    assert list(Comment.objects.thread(first)) == [first, answer, nested]
+
+
+def test_reply_to_comment_of_another_post_is_rejected(
+        user_client, post_with_published_location, comment_to_a_post,
+        mixer):
+    foreign = mixer.blend("blog.Comment")
+    post = post_with_published_location
+    user_client.post(
+        f"/posts/{post.id}/comment/",
+        data={"text": "Чужой", "parent": foreign.id},
+    )
+    assert not Comment.objects.filter(text="Чужой").exists()
+
+
+def test_deep_replies_are_attached_to_last_allowed_level(
+        user_client, post_with_published_location):
+    post = post_with_published_location
+    parent = reply(user_client, post, "Уровень 0")
+    for level in range(1, COMMENT_MAX_DEPTH + 3):
+        parent = reply(user_client, post, f"Уровень {level}", parent=parent)
+    assert parent.depth == COMMENT_MAX_DEPTH
+
+
+def test_deleting_comment_removes_its_thread(
+        user_client, post_with_published_location):
+    post = post_with_published_location
+    root = reply(user_client, post, "Корень")
+    reply(user_client, post, "Ответ", parent=root)
+    reply(user_client, post, "Другой")
+
+    user_client.post(f"/posts/{post.id}/delete_comment/{root.id}/")
+    post.refresh_from_db()
+    assert list(post.comments.values_list("text", flat=True)) == ["Другой"]
+    assert post.comment_count == 1
+
+
+@pytest.mark.skipif(
+    connection.vendor != "sqlite", reason="Планы запросов сняты для SQLite"
+)
+def test_thread_query_uses_index(comment_to_a_post):
+    thread = Comment.objects.thread(comment_to_a_post)
+    sql, params = thread.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+        plan = "\n".join(row[-1] for row in cursor.fetchall())
+    assert "comment_thread_idx" in plan
+    assert "TEMP B-TREE" not in plan
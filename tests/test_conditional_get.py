@@ -0,0 +1,121 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.test.signals import template_rendered
+from django.utils import timezone
+from mixer.backend.django import Mixer
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def page_urls(post_with_published_location):
+    post = post_with_published_location
+    return [
+        "/",
+        f"/category/{post.category.slug}/",
+        f"/profile/{post.author.username}/",
+        f"/posts/{post.id}/",
+    ]
+
+
+def revalidate(client, url, response):
+    rendered = []
+
+    def on_render(sender, **kwargs):
+        rendered.append(sender)
+
+    template_rendered.connect(on_render)
+    try:
+        return client.get(
+            url, headers={"If-None-Match": response["ETag"]}
+        ), rendered
+    finally:
+        template_rendered.disconnect(on_render)
+
+
+@pytest.mark.parametrize("logged_in", [False, True])
+def test_unchanged_page_is_not_modified(
+        client, user_client, page_urls, logged_in):
+    client = user_client if logged_in else client
+    for url in page_urls:
+        response = client.get(url)
+        assert response.has_header("ETag")
+        assert response.has_header("Last-Modified")
+        repeated, rendered = revalidate(client, url, response)
+        assert repeated.status_code == HTTPStatus.NOT_MODIFIED, (
+            f"Убедитесь, что неизменившаяся страница {url} отдаёт 304."
+        )
+        assert not rendered
+
+
+def test_changes_produce_new_etag(
+        mixer: Mixer, user_client, page_urls, post_with_published_location,
+        comment_to_a_post):
+    responses = {url: user_client.get(url) for url in page_urls}
+    comment_to_a_post.text = "Исправленный комментарий"
+    comment_to_a_post.save()
+    detail_url = page_urls[-1]
+    repeated, _ = revalidate(user_client, detail_url, responses[detail_url])
+    assert repeated.status_code == HTTPStatus.OK, (
+        "Убедитесь, что правка комментария меняет ETag страницы поста."
+    )
+
+    post_with_published_location.title = "Новый заголовок"
+    post_with_published_location.save()
+    for url, response in responses.items():
+        repeated, _ = revalidate(user_client, url, response)
+        assert repeated.status_code == HTTPStatus.OK
+
+
+def test_etag_differs_between_viewers(client, user_client, page_urls):
+    assert client.get("/")["ETag"] != user_client.get("/")["ETag"]
+
+
+def test_cached_page_revalidates_without_queries(
+        client, django_assert_num_queries, page_urls):
+    for url in page_urls:
+        response = client.get(url)
+        with django_assert_num_queries(0):
+            repeated = client.get(
+                url, headers={"If-None-Match": response["ETag"]}
+            )
+        assert repeated.status_code == HTTPStatus.NOT_MODIFIED, (
+            f"Убедитесь, что {url} из кэша страниц отвечает 304 "
+            "без запросов к базе."
+        )
+
+
+def test_new_comment_changes_last_modified(
+        user_client, another_user_client, post_with_published_location):
+    from blog.models import Post
+
+    post = post_with_published_location
+    # Last-Modified с точностью до секунды: сдвигаем правку в прошлое.
+    Post.objects.filter(pk=post.pk).update(
+        updated_at=timezone.now() - timedelta(hours=1)
+    )
+    url = f"/posts/{post.id}/"
+    response = user_client.get(url)
+    another_user_client.post(f"{url}comment/", data={"text": "Новый"})
+    repeated = user_client.get(
+        url, headers={"If-Modified-Since": response["Last-Modified"]}
+    )
+    assert repeated.status_code == HTTPStatus.OK, (
+        "Убедитесь, что новый комментарий сдвигает Last-Modified поста."
+    )
+
+
+def test_rename_without_posts_changes_profile_etag(
+        user_client, another_user):
+    url = f"/profile/{another_user.username}/"
+    response = user_client.get(url)
+    another_user.first_name = "Переименованный"
+    another_user.save()
+    repeated, _ = revalidate(user_client, url, response)
+    assert repeated.status_code == HTTPStatus.OK, (
+        "Убедитесь, что смена имени меняет ETag профиля, даже если "
+        "у пользователя нет публикаций."
+    )
+    assert "Переименованный" in repeated.content.decode()
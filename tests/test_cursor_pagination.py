@@ -0,0 +1,96 @@
+from datetime import timedelta
+
+import pytest
+from conftest import N_PER_PAGE
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from mixer.backend.django import Mixer
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def feed_posts(mixer: Mixer, user, published_category):
+    now = timezone.now()
+    same_date = now - timedelta(days=1)
+    pub_dates = [same_date] * 5 + [
+        now - timedelta(hours=hours) for hours in range(1, N_PER_PAGE * 2)
+    ]
+    return mixer.cycle(len(pub_dates)).blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        is_published=True,
+        pub_date=(date for date in pub_dates),
+    )
+
+
+def collect_pages(client, url, direction):
+    seen = []
+    query = "" if direction == "next_cursor" else "?cursor=last"
+    while True:
+        page_obj = client.get(url + query).context["page_obj"]
+        assert len(page_obj) <= N_PER_PAGE
+        ids = [post.id for post in page_obj]
+        seen = seen + ids if direction == "next_cursor" else ids + seen
+        cursor = getattr(page_obj, direction)
+        if cursor is None:
+            return seen
+        query = f"?cursor={cursor}"
+
+
+@pytest.mark.parametrize("direction", ["next_cursor", "previous_cursor"])
+def test_cursor_walks_whole_feed(client, feed_posts, direction):
+    from blog.models import Post
+
+    expected = list(
+        Post.objects.order_by("-pub_date", "-id").values_list("id", flat=True)
+    )
+    assert collect_pages(client, "/", direction) == expected, (
+        "Убедитесь, что курсорная пагинация обходит ленту целиком,"
+        " без пропусков и повторов."
+    )
+
+
+def test_cursor_page_has_no_count_query(client, feed_posts):
+    from blog.paginators import CursorPaginator
+
+    first_page = client.get("/").context["page_obj"]
+    with CaptureQueriesContext(connection) as captured:
+        client.get(f"/?cursor={CursorPaginator.LAST}")
+    assert not any("COUNT(*)" in q["sql"] for q in captured.captured_queries), (
+        "Убедитесь, что курсорная пагинация не выполняет SELECT COUNT(*)."
+    )
+    assert first_page.has_next() and not first_page.has_previous()
+
+
+def test_broken_cursor_falls_back_to_first_page(client, feed_posts):
+    response = client.get("/?cursor=not-a-cursor")
+    assert response.status_code == 200
+    assert not response.context["page_obj"].has_previous()
+
+
+def test_page_number_still_supported(client, feed_posts):
+    response = client.get("/?page=2")
+    assert response.context["page_obj"].number == 2
+
+
+def test_cursor_over_values_rows(feed_posts):
+    from django.core.exceptions import ImproperlyConfigured
+
+    from blog.models import Post
+    from blog.paginators import CursorPaginator
+
+    rows = Post.objects.values("author", "id", "title")
+    paginator = CursorPaginator(rows, 2, ordering=("author", "id"))
+    page = paginator.page()
+    assert paginator.page(page.next_cursor)[0]["id"] == feed_posts[2].id, (
+        "Курсор по строкам values() должен учитывать сортировку по "
+        "внешнему ключу."
+    )
+    paginator = CursorPaginator(
+        Post.objects.values("title"), 2, ordering=("-pub_date", "-id")
+    )
+    with pytest.raises(ImproperlyConfigured):
+        paginator.page()
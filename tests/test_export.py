@@ -0,0 +1,73 @@
+import csv
+import io
+import json
+
+import pytest
+from django.core.management import call_command
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def staff_client(client, user):
+    user.is_staff = True
+    user.save()
+    client.force_login(user)
+    return client
+
+
+@pytest.fixture
+def commented_post(mixer, post_with_published_location):
+    mixer.cycle(3).blend("blog.Comment", post=post_with_published_location)
+    return post_with_published_location
+
+
+def test_export_is_staff_only(client, user_client):
+    assert client.get("/export/posts/").status_code == 302
+    assert user_client.get("/export/posts/").status_code == 403, (
+        "Выгрузка должна быть доступна только сотрудникам."
+    )
+
+
+@pytest.mark.parametrize(
+    "url", ["/export/users/", "/export/posts/?format=xml"]
+)
+def test_unknown_export_is_404(staff_client, url):
+    assert staff_client.get(url).status_code == 404
+
+
+def test_posts_csv(staff_client, commented_post):
+    response = staff_client.get("/export/posts/")
+    assert response.streaming, (
+        "Выгрузка должна отдаваться через StreamingHttpResponse."
+    )
+    assert response["Content-Type"].startswith("text/csv")
+    content = b"".join(response.streaming_content).decode()
+    rows = list(csv.DictReader(io.StringIO(content)))
+    assert len(rows) == 1
+    row = rows[0]
+    assert row["author"] == commented_post.author.username
+    assert row["category"] == commented_post.category.slug
+    assert row["location"] == commented_post.location.name
+    assert row["comment_count"] == str(commented_post.comment_count)
+
+
+def test_comments_jsonl(staff_client, commented_post):
+    response = staff_client.get("/export/comments/?format=jsonl")
+    lines = b"".join(response.streaming_content).decode().splitlines()
+    comments = [json.loads(line) for line in lines]
+    assert [comment["post"] for comment in comments] == [commented_post.pk] * 3
+    assert {"id", "author", "parent", "created_at", "text"} <= set(
+        comments[0]
+    )
+
+
+def test_export_command(tmp_path, commented_post):
+    out = io.StringIO()
+    call_command("export_data", "comments", "--format", "jsonl",
+                 "--chunk-size", "2", stdout=out)
+    assert len(out.getvalue().splitlines()) == 3
+    path = tmp_path / "posts.csv"
+    call_command("export_data", "posts", "--output", str(path))
+    with open(path, encoding="utf-8", newline="") as file:
+        assert len(list(csv.DictReader(file))) == 1
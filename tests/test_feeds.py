@@ -0,0 +1,73 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def hidden_posts(mixer, user, published_category):
+    future = timezone.now() + timedelta(days=1)
+    return [
+        mixer.blend("blog.Post", title="Отложенный пост", pub_date=future,
+                    author=user, category=published_category),
+        mixer.blend("blog.Post", title="Скрытый пост", is_published=False,
+                    author=user, category=published_category),
+    ]
+
+
+@pytest.mark.parametrize(
+    "url, content_type",
+    [
+        ("/feed/", "application/rss+xml"),
+        ("/feed/atom/", "application/atom+xml"),
+        ("/category/{post.category.slug}/feed/", "application/rss+xml"),
+        ("/category/{post.category.slug}/feed/atom/", "application/atom+xml"),
+        ("/profile/{post.author.username}/feed/", "application/rss+xml"),
+        ("/profile/{post.author.username}/feed/atom/",
+         "application/atom+xml"),
+    ],
+)
+def test_feeds_show_only_published_posts(
+        client, post_with_published_location, hidden_posts, url,
+        content_type):
+    response = client.get(url.format(post=post_with_published_location))
+    assert response.status_code == 200
+    assert response["Content-Type"].startswith(content_type)
+    content = response.content.decode()
+    assert post_with_published_location.title in content
+    for post in hidden_posts:
+        assert post.title not in content, (
+            "В ленту должны попадать только опубликованные посты."
+        )
+
+
+def test_unpublished_category_feed_is_404(client, mixer):
+    category = mixer.blend("blog.Category", is_published=False)
+    assert client.get(f"/category/{category.slug}/feed/").status_code == 404
+
+
+def test_feed_conditional_get(client, django_assert_num_queries,
+                              post_with_published_location):
+    response = client.get("/feed/")
+    assert response["X-Page-Cache"] == "MISS"
+    etag, last_modified = response["ETag"], response["Last-Modified"]
+    with django_assert_num_queries(0):
+        response = client.get("/feed/", HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 304, (
+        "Лента должна отвечать 304 на совпадающий If-None-Match."
+    )
+    response = client.get("/feed/", HTTP_IF_MODIFIED_SINCE=last_modified)
+    assert response.status_code == 304
+
+
+def test_feed_is_invalidated_on_edit(client, post_with_published_location):
+    etag = client.get("/feed/")["ETag"]
+    post_with_published_location.title = "Новый заголовок"
+    post_with_published_location.save()
+    response = client.get("/feed/", HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200, (
+        "После правки поста лента должна сбрасываться из кэша."
+    )
+    assert "Новый заголовок" in response.content.decode()
@@ -0,0 +1,56 @@
+import io
+import json
+from pathlib import Path
+
+import pytest
+from django.core.management import call_command
+
+from blog.loading import ArrayReader, dependency_order
+from blog.models import Category, Comment, Location, Post, User
+from blog.search import search_posts
+
+DB_JSON = Path(__file__).resolve().parent.parent / "db.json"
+
+
+def test_array_reader_matches_json_load():
+    text = DB_JSON.read_text(encoding="utf-8")
+    assert list(ArrayReader(io.StringIO(text), read_size=7)) == json.loads(
+        text
+    ), "Потоковый разбор должен давать те же объекты, что и json.load."
+
+
+@pytest.mark.parametrize("text", ["{}", "[{}, {"])
+def test_array_reader_rejects_broken_dump(text):
+    with pytest.raises(ValueError):
+        list(ArrayReader(io.StringIO(text), read_size=2))
+
+
+def test_dependency_order():
+    order = dependency_order([Comment, Post, User, Category, Location])
+    assert order.index(User) < order.index(Post) < order.index(Comment)
+    assert order.index(Category) < order.index(Post)
+    assert order.index(Location) < order.index(Post)
+
+
+@pytest.mark.django_db
+def test_load_dump_restores_db_json():
+    call_command("load_dump", str(DB_JSON), batch_size=5,
+                 stdout=io.StringIO())
+    records = json.loads(DB_JSON.read_text(encoding="utf-8"))
+    for model in (Post, Category, Location, User):
+        expected = sum(
+            record["model"] == model._meta.label_lower for record in records
+        )
+        assert model.objects.count() == expected
+    post = Post.objects.get(pk=1)
+    assert post.created_at.isoformat().startswith("2022-12-18"), (
+        "Даты из дампа не должны заменяться текущим временем."
+    )
+    assert post.is_visible, (
+        "Опубликованные посты из дампа должны стать видимыми."
+    )
+    assert search_posts(Post.objects.all(), post.title).exists()
+    new_post = Post.objects.create(
+        title="Новый", text="Текст", author=post.author,
+    )
+    assert new_post.pk > Post.objects.exclude(pk=new_post.pk).count()
@@ -0,0 +1,80 @@
+import json
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.urls import get_resolver
+from django.utils import timezone
+
+from blog.management.commands.loadtest import discover_routes
+from blog.models import Comment, Post
+from blog.search import search_posts
+from blog.seed import seed
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_discover_routes_covers_blog_and_pages():
+    names = {name for name, _ in discover_routes()}
+    expected = {
+        f"{namespace}:{name}"
+        for namespace in ("blog", "pages")
+        for name in get_resolver().namespace_dict[namespace][1].reverse_dict
+        if isinstance(name, str)
+    }
+    assert names == expected
+
+
+def test_seed_builds_consistent_dataset():
+    dataset = seed(users=3, categories=2, locations=2, posts=20, comments=50)
+    assert Post.objects.count() == dataset["posts"]
+    assert Post.objects.published().count() == dataset["posts"]
+    assert not Comment.objects.filter(path="").exists()
+    for post in Post.objects.all():
+        assert post.comment_count == post.comments.count()
+    word = Post.objects.first().title.split()[0]
+    assert search_posts(Post.objects.all(), word).exists()
+
+
+def test_seed_distributions():
+    dataset = seed(users=10, categories=2, locations=2, posts=200,
+                   comments=2000, future_share=0.2, hidden_share=0.1)
+    visible = Post.objects.filter(is_visible=True)
+    assert Post.objects.count() == dataset["posts"]
+    assert Post.objects.filter(pub_date__gt=timezone.now()).exists()
+    assert Post.objects.filter(is_published=False).exists()
+    assert not Comment.objects.exclude(post__in=visible).exists(), (
+        "Комментарии должны доставаться только видимым публикациям."
+    )
+    counts = sorted(visible.values_list("comment_count", flat=True))
+    top = sum(counts[-len(counts) // 10:])
+    assert top > dataset["comments"] * 0.3, (
+        "Число комментариев на пост должно подчиняться степенному закону."
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+def test_seed_database_command_reports_rate():
+    out = StringIO()
+    call_command("seed_database", users=5, categories=2, locations=2,
+                 posts=50, comments=200, stdout=out)
+    assert "строк/с" in out.getvalue()
+    assert Comment.objects.count() == 200
+    assert search_posts(Post.objects.all(), "город").exists()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_loadtest_command_reports_every_route(tmp_path):
+    out, report_path = StringIO(), tmp_path / "report.json"
+    call_command("loadtest", users=3, posts=20, comments=40, requests=2,
+                 concurrency=1, json_path=str(report_path), stdout=out)
+    report = json.loads(report_path.read_text(encoding="utf-8"))
+    names = {route["name"] for route in report["routes"]}
+    assert names == {name for name, _ in discover_routes()}, (
+        "Отчёт loadtest должен покрывать все маршруты blog и pages."
+    )
+    assert all(route["errors"] == 0 for route in report["routes"])
+    assert all(route["requests"] == 2 for route in report["routes"])
+    lines = out.getvalue().splitlines()
+    assert lines[0].split()[:2] == ["маршрут", "зап/с"]
+    assert len(lines) == len(report["routes"]) + 1
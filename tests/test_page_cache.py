@@ -0,0 +1,90 @@
+import pytest
+from django.contrib.auth import get_user_model
+from mixer.backend.django import Mixer
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def page_urls(post_with_published_location):
+    post = post_with_published_location
+    return {
+        "index": "/",
+        "category": f"/category/{post.category.slug}/",
+        "profile": f"/profile/{post.author.username}/",
+        "detail": f"/posts/{post.id}/",
+    }
+
+
+def cache_status(client, url):
+    response = client.get(url)
+    assert response.status_code == 200
+    return response.get("X-Page-Cache")
+
+
+def test_anonymous_pages_are_cached(client, page_urls):
+    from blog.cache import page_cache_stats
+
+    for url in page_urls.values():
+        assert cache_status(client, url) == "MISS"
+    for url in page_urls.values():
+        assert cache_status(client, url) == "HIT", (
+            f"Убедитесь, что страница {url} кэшируется для анонимов."
+        )
+    assert page_cache_stats() == {"hits": 4, "misses": 4}
+
+
+def test_logged_in_pages_are_not_cached(user_client, page_urls):
+    for url in page_urls.values():
+        assert cache_status(user_client, url) is None
+        assert cache_status(user_client, url) is None
+
+
+def test_post_save_purges_its_pages(
+        mixer: Mixer, client, page_urls, post_with_published_location,
+        another_category):
+    other_post = mixer.blend("blog.Post", category=another_category)
+    other_url = f"/posts/{other_post.id}/"
+    for url in (*page_urls.values(), other_url):
+        cache_status(client, url)
+
+    post_with_published_location.title = "Новый заголовок"
+    post_with_published_location.save()
+
+    for name, url in page_urls.items():
+        assert cache_status(client, url) == "MISS", (
+            f"Убедитесь, что сохранение поста сбрасывает страницу {name}."
+        )
+    assert cache_status(client, other_url) == "HIT"
+
+
+def test_comment_purges_post_page(client, page_urls, comment_to_a_post):
+    cache_status(client, page_urls["detail"])
+    comment_to_a_post.text = "Другой текст"
+    comment_to_a_post.save()
+    response = client.get(page_urls["detail"])
+    assert response.get("X-Page-Cache") == "MISS"
+    assert "Другой текст" in response.content.decode()
+
+
+def test_user_saves_keep_unrelated_pages_cached(
+        client, mixer, user, another_user, post_with_published_location):
+    post = post_with_published_location
+    urls = ["/", f"/posts/{post.id}/", f"/profile/{another_user.username}/"]
+    for url in urls:
+        client.get(url)
+    mixer.blend(get_user_model())
+    another_user.set_password("new-password")
+    another_user.save()
+    another_user.first_name = "Новое имя"
+    another_user.save()
+    assert [client.get(url)["X-Page-Cache"] for url in urls] == [
+        "HIT", "HIT", "MISS"
+    ], (
+        "Регистрация и смена пароля не должны сбрасывать кэш страниц, "
+        "а смена имени — только страницы с этим пользователем."
+    )
+    user.username = "renamed-author"
+    user.save()
+    assert "renamed-author" in client.get(f"/posts/{post.id}/").content.decode(
+    ), "Смена имени автора должна сбрасывать страницы его постов."
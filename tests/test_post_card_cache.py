@@ -0,0 +1,43 @@
+import pytest
+from django.test.signals import template_rendered
+from mixer.backend.django import Mixer
+
+pytestmark = [pytest.mark.django_db]
+
+
+def rendered_cards(client, url):
+    rendered = []
+
+    def on_render(sender, template, **kwargs):
+        if template.name == "includes/post_card.html":
+            rendered.append(template)
+
+    template_rendered.connect(on_render)
+    try:
+        response = client.get(url)
+    finally:
+        template_rendered.disconnect(on_render)
+    assert response.status_code == 200
+    return response, len(rendered)
+
+
+def test_cards_come_from_cache(
+        mixer: Mixer, user_client, many_posts_with_published_locations):
+    _, first = rendered_cards(user_client, "/")
+    assert first == 10
+    response, second = rendered_cards(user_client, "/")
+    assert second == 0, (
+        "Убедитесь, что карточки постов берутся из кэша фрагментов."
+    )
+
+    post = response.context["page_obj"][0]
+    mixer.blend("blog.Comment", post=post)
+    type(post).objects.filter(pk=post.pk).update(comment_count=1)
+    response, third = rendered_cards(user_client, "/")
+    assert third == 1 and "Комментарии (1)" in response.content.decode()
+
+    post.refresh_from_db()
+    post.title = "Новый заголовок"
+    post.save()
+    response, fourth = rendered_cards(user_client, "/")
+    assert fourth == 1 and "Новый заголовок" in response.content.decode()
@@ -0,0 +1,92 @@
+import time
+
+import pytest
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from django.http import HttpResponse
+
+from core.middleware import SamplingProfilerMiddleware
+from core.profiler import StackSampler, collapsed_stacks, profiles
+
+pytestmark = [pytest.mark.django_db]
+
+
+def busy_loop(seconds):
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+def test_sampler_collects_collapsed_stacks():
+    with StackSampler(0.001) as sampler:
+        busy_loop(0.05)
+    assert sampler.stacks, "Убедитесь, что StackSampler снимает стеки."
+    stack = sampler.stacks.most_common(1)[0][0]
+    assert stack.endswith("test_profiler:busy_loop"), (
+        "Стек в формате collapsed должен идти от корня к листу."
+    )
+
+
+def test_staff_header_profiles_request(settings, admin_client):
+    settings.PROFILER_SAMPLE_RATE = 0
+    admin_client.get("/", HTTP_X_PROFILE="1")
+    assert [profile["view_name"] for profile in profiles()] == [
+        "blog:index"
+    ], "Запрос сотрудника с заголовком X-Profile должен профилироваться."
+    assert collapsed_stacks("blog:index") is not None
+
+
+def test_header_is_ignored_for_visitors(settings, user_client):
+    settings.PROFILER_SAMPLE_RATE = 0
+    user_client.get("/", HTTP_X_PROFILE="1")
+    assert profiles() == [], (
+        "Заголовок X-Profile не должен включать профилирование "
+        "для обычных пользователей."
+    )
+
+
+def test_sample_rate_profiles_anonymous_requests(settings, client):
+    settings.PROFILER_SAMPLE_RATE = 1
+    client.get("/")
+    client.get("/pages/about/")
+    assert {profile["view_name"] for profile in profiles()} == {
+        "blog:index", "pages:about"
+    }
+
+
+def test_profiler_admin_is_staff_only(settings, client, user_client,
+                                      admin_client):
+    settings.PROFILER_SAMPLE_RATE = 1
+    client.get("/")
+    for visitor in (client, user_client):
+        response = visitor.get("/admin/profiler/")
+        assert response.status_code == 302, (
+            "Страница профилей должна быть доступна только сотрудникам."
+        )
+        assert visitor.get("/admin/profiler/blog:index/").status_code == 302
+    settings.PROFILER_SAMPLE_RATE = 0
+    assert "blog:index" in admin_client.get(
+        "/admin/profiler/"
+    ).content.decode()
+    response = admin_client.get("/admin/profiler/blog:index/")
+    assert response["Content-Type"].startswith("text/plain")
+    admin_client.post("/admin/profiler/")
+    assert profiles() == []
+    assert admin_client.get("/admin/profiler/blog:index/").status_code == 404
+
+
+def test_async_chain_profiles_without_adapter(settings, admin_user,
+                                              async_client):
+    async def get_response(request):
+        return HttpResponse()
+
+    assert iscoroutinefunction(SamplingProfilerMiddleware(get_response)), (
+        "Убедитесь, что профилировщик встаёт в async-цепочку "
+        "без обёртки sync_to_async."
+    )
+    settings.PROFILER_SAMPLE_RATE = 0
+    settings.PROFILER_INTERVAL = 0.0005
+    async_client.force_login(admin_user)
+    async_to_sync(async_client.get)("/async/", headers={"X-Profile": "1"})
+    assert [profile["view_name"] for profile in profiles()] == [
+        "blog:async_index"
+    ]
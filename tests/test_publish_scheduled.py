@@ -0,0 +1,40 @@
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_scheduler_opens_due_posts(client, future_posts):
+    from blog.models import Post
+
+    assert not Post.objects.published().exists()
+    assert client.get("/").get("X-Page-Cache") == "MISS"
+    assert client.get("/").get("X-Page-Cache") == "HIT"
+
+    due_post = future_posts[0]
+    Post.objects.filter(pk=due_post.pk).update(
+        pub_date=timezone.now() - timedelta(minutes=1)
+    )
+    call_command("publish_scheduled")
+
+    assert list(Post.objects.published()) == [due_post], (
+        "Убедитесь, что publish_scheduled открывает только те отложенные"
+        " публикации, время которых наступило."
+    )
+    response = client.get("/")
+    assert response.get("X-Page-Cache") == "MISS", (
+        "Убедитесь, что открытие публикации сбрасывает кэш ленты."
+    )
+    assert list(response.context["page_obj"]) == [due_post]
+
+
+def test_save_recomputes_visibility(post_with_published_location):
+    post = post_with_published_location
+    assert post.is_visible
+    post.pub_date = timezone.now() + timedelta(days=1)
+    post.save(update_fields=["pub_date"])
+    post.refresh_from_db()
+    assert not post.is_visible
@@ -0,0 +1,72 @@
+import logging
+
+import pytest
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from django.http import HttpResponse
+from django.test import Client
+from django.urls import resolve, reverse
+from django.utils.module_loading import import_string
+
+from blog.management.commands.loadtest import Command, discover_routes
+from blog.async_views import AsyncHomePageView
+from blog.seed import seed
+from core.middleware import QueryBudgetExceeded
+from blog.views import HomePageListView
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_blog_views_declare_query_budget():
+    for name, params in discover_routes():
+        if not name.startswith("blog:"):
+            continue
+        url = reverse(name, kwargs={key: 1 for key in params})
+        func = resolve(url).func
+        view = getattr(func, "view_class", func)
+        assert isinstance(getattr(view, "query_budget", None), int), (
+            f"Задайте `query_budget` у вида `{view!r}`."
+        )
+
+
+@pytest.mark.parametrize("authenticated", [False, True])
+def test_routes_within_query_budget(assert_query_budget, authenticated):
+    seed(users=3, categories=2, locations=2, posts=30, comments=150)
+    for name, url, user in Command().build_urls(authenticated):
+        client = Client()
+        if user is not None:
+            client.force_login(user)
+        response = assert_query_budget(client, url)
+        assert response.status_code < 400, (
+            f"Страница `{name}` ({url}) ответила {response.status_code}."
+        )
+
+
+def test_over_budget_is_logged(settings, client, monkeypatch, caplog):
+    settings.QUERY_BUDGET_ACTION = "log"
+    monkeypatch.setattr(HomePageListView, "query_budget", 0)
+    with caplog.at_level(logging.WARNING, logger="core.middleware"):
+        client.get("/")
+    assert "при бюджете 0" in caplog.text, (
+        "Убедитесь, что превышение бюджета запросов пишется в журнал."
+    )
+
+
+@pytest.mark.parametrize(
+    "middleware", ["core.middleware.QueryBudgetMiddleware"]
+)
+def test_middleware_runs_natively_under_asgi(middleware):
+    async def get_response(request):
+        return HttpResponse()
+
+    instance = import_string(middleware)(get_response)
+    assert iscoroutinefunction(instance), (
+        f"Убедитесь, что `{middleware}` встаёт в async-цепочку "
+        "без обёртки sync_to_async."
+    )
+
+
+def test_async_view_queries_are_counted(monkeypatch, async_client,
+                                        post_with_published_location):
+    monkeypatch.setattr(AsyncHomePageView, "query_budget", 0)
+    with pytest.raises(QueryBudgetExceeded):
+        async_to_sync(async_client.get)("/async/")
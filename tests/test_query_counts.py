@@ -0,0 +1,34 @@
+import pytest
+from mixer.backend.django import Mixer
+
+pytestmark = [pytest.mark.django_db]
+
+SESSION_QUERIES = 2
+
+
+@pytest.fixture
+def populated_post(mixer: Mixer, many_posts_with_published_locations):
+    post = many_posts_with_published_locations[0]
+    mixer.cycle(5).blend("blog.Comment", post=post)
+    return post
+
+
+@pytest.mark.parametrize(
+    "url_template, expected",
+    [
+        ("/", 1),
+        ("/category/{post.category.slug}/", 2),
+        ("/profile/{post.author.username}/", 3),
+        ("/posts/{post.id}/", 2),
+    ],
+)
+@pytest.mark.parametrize("logged_in", [False, True])
+def test_page_query_count(
+        client, user_client, django_assert_num_queries, populated_post,
+        url_template, expected, logged_in):
+    url = url_template.format(post=populated_post)
+    if logged_in:
+        client, expected = user_client, expected + SESSION_QUERIES
+    with django_assert_num_queries(expected):
+        response = client.get(url)
+    assert response.status_code == 200
@@ -0,0 +1,55 @@
+import re
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from mixer.backend.django import Mixer
+
+pytestmark = [pytest.mark.django_db]
+
+FULL_SCAN = re.compile(r"\bSCAN (?:blog_post|\"blog_post\")(?! USING)")
+
+
+@pytest.fixture
+def feed_posts(mixer: Mixer, user, published_category):
+    return mixer.cycle(15).blend(
+        "blog.Post", author=user, category=published_category
+    )
+
+
+def explain_post_queries(client, url):
+    with CaptureQueriesContext(connection) as captured:
+        response = client.get(url)
+    assert response.status_code == 200
+    plans = []
+    with connection.cursor() as cursor:
+        for query in captured.captured_queries:
+            sql = query["sql"]
+            if not re.match(r'SELECT .* FROM "blog_post"', sql):
+                continue
+            cursor.execute(f"EXPLAIN QUERY PLAN {sql}")
+            plans.append(
+                (sql, "\n".join(row[-1] for row in cursor.fetchall()))
+            )
+    assert plans, f"Страница {url} не запрашивает публикации."
+    return plans
+
+
+@pytest.mark.skipif(
+    connection.vendor != "sqlite", reason="Планы запросов сняты для SQLite"
+)
+@pytest.mark.parametrize(
+    "url_template",
+    [
+        "/",
+        "/category/{post.category.slug}/",
+        "/profile/{post.author.username}/",
+    ],
+)
+def test_feed_queries_use_index(client, feed_posts, url_template):
+    url = url_template.format(post=feed_posts[0])
+    for sql, plan in explain_post_queries(client, url):
+        assert not FULL_SCAN.search(plan), (
+            f"Запрос публикаций страницы {url} читает таблицу целиком:\n"
+            f"{sql}\n{plan}"
+        )
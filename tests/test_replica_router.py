@@ -0,0 +1,112 @@
+import sqlite3
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection, connections
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+
+pytestmark = [
+    pytest.mark.django_db(transaction=True, databases=["default", "replica"]),
+    pytest.mark.skipif(
+        connection.vendor != "sqlite", reason="Реплика — копия файла SQLite"
+    ),
+]
+
+
+@pytest.fixture(scope="module", autouse=True)
+def replica_alias(django_db_setup, tmp_path_factory):
+    """Псевдоним реплики; объявлен до того, как тест откроет базы."""
+    path = tmp_path_factory.mktemp("replica") / "replica.sqlite3"
+    connections.settings["replica"] = {
+        **connections.settings["default"], "NAME": str(path)
+    }
+    yield path
+    connections["replica"].close()
+    del connections["replica"]
+    del connections.settings["replica"]
+
+
+@pytest.fixture
+def replica(replica_alias, settings, post_with_published_location):
+    """Снимок базы в файле, который дальше отстаёт от основной."""
+    connections["replica"].close()
+    target = sqlite3.connect(replica_alias)
+    connection.connection.backup(target)
+    target.close()
+    settings.DATABASE_REPLICAS = ["replica"]
+    return connections["replica"]
+
+
+@pytest.fixture
+def reader_client(mixer):
+    client = Client()
+    client.force_login(mixer.blend(get_user_model()))
+    return client
+
+
+def test_reads_go_to_replica_until_viewer_writes(
+        reader_client, another_user_client, post_with_published_location,
+        replica):
+    url = f"/posts/{post_with_published_location.id}/"
+    response = another_user_client.post(
+        f"{url}comment/", data={"text": "Свежий комментарий"}
+    )
+    assert response.cookies["primary_reads"]["max-age"]
+
+    with CaptureQueriesContext(replica) as replica_queries:
+        own_content = another_user_client.get(url).content.decode()
+    assert "Свежий комментарий" in own_content, (
+        "Убедитесь, что после записи пользователь читает с основной базы."
+    )
+    assert not replica_queries.captured_queries
+
+    with CaptureQueriesContext(replica) as replica_queries:
+        content = reader_client.get(url).content.decode()
+    assert replica_queries.captured_queries, (
+        "Убедитесь, что страница поста читается с реплики."
+    )
+    assert "Свежий комментарий" not in content
+
+
+def test_author_pages_stay_on_primary(
+        user_client, post_with_published_location, replica):
+    post = post_with_published_location
+    with CaptureQueriesContext(replica) as replica_queries:
+        user_client.get(f"/profile/{post.author.username}/")
+        user_client.get(f"/posts/{post.id}/")
+    assert not replica_queries.captured_queries, (
+        "Убедитесь, что автор видит свои страницы с основной базы."
+    )
+
+
+@pytest.mark.parametrize(
+    "url_template", ["/", "/category/{post.category.slug}/"]
+)
+def test_feeds_read_from_replica(
+        user_client, post_with_published_location, replica, url_template):
+    url = url_template.format(post=post_with_published_location)
+    with CaptureQueriesContext(replica) as replica_queries:
+        response = user_client.get(url)
+    assert response.status_code == 200
+    assert replica_queries.captured_queries
+
+
+@pytest.mark.parametrize(
+    "url_template", ["/", "/posts/{post.id}/"]
+)
+def test_cached_pages_render_from_primary(
+        client, another_user_client, post_with_published_location, replica,
+        url_template):
+    post = post_with_published_location
+    another_user_client.post(
+        f"/posts/{post.id}/comment/", data={"text": "Свежий комментарий"}
+    )
+    url = url_template.format(post=post)
+    with CaptureQueriesContext(replica) as replica_queries:
+        response = client.get(url)
+    assert response["X-Page-Cache"] == "MISS"
+    assert not replica_queries.captured_queries, (
+        "Убедитесь, что страница для общего кэша собирается на основной "
+        "базе: иначе в кэше надолго останется версия с отстающей реплики."
+    )
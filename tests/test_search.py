@@ -0,0 +1,49 @@
+import pytest
+from mixer.backend.django import Mixer
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def searchable_posts(mixer: Mixer, user, published_category):
+    def blend(title, text, **kwargs):
+        return mixer.blend(
+            "blog.Post", author=user, category=published_category,
+            title=title, text=text, **kwargs
+        )
+
+    return {
+        "title_hit": blend("Путешествие на Байкал", "Озеро и горы"),
+        "text_hit": blend("Заметки", "Мы снова поехали на Байкал летом"),
+        "hidden": blend("Байкал зимой", "Черновик", is_published=False),
+        "miss": blend("Рецепт пирога", "Мука, яйца, сахар"),
+    }
+
+
+def found(client, query):
+    response = client.get("/search/", {"q": query})
+    assert response.status_code == 200
+    return list(response.context["page_obj"])
+
+
+def test_search_ranks_and_hides_unpublished(user_client, searchable_posts):
+    assert found(user_client, "байкал") == [
+        searchable_posts["title_hit"], searchable_posts["text_hit"]
+    ], (
+        "Убедитесь, что поиск находит только опубликованные посты и"
+        " ставит совпадения в заголовке выше."
+    )
+    assert found(user_client, "пирог") == [searchable_posts["miss"]]
+    assert found(user_client, '"байк* (') == found(user_client, "байк"), (
+        "Убедитесь, что синтаксис FTS5 во вводе не ломает поиск."
+    )
+
+
+def test_index_follows_post_changes(user_client, searchable_posts):
+    post = searchable_posts["miss"]
+    post.title = "Пирог с Байкала"
+    post.save()
+    assert post in found(user_client, "байкал")
+
+    post.delete()
+    assert found(user_client, "пирог") == []
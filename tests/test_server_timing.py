@@ -0,0 +1,72 @@
+import re
+
+import pytest
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from django.db import connection
+from django.http import HttpResponse
+from django.test.utils import CaptureQueriesContext
+
+from core.middleware import ServerTimingMiddleware
+
+pytestmark = [pytest.mark.django_db]
+
+
+def parse_server_timing(header):
+    metrics = {}
+    for metric in header.split(", "):
+        name, *params = metric.split(";")
+        metrics[name] = dict(param.split("=", 1) for param in params)
+    return metrics
+
+
+@pytest.mark.parametrize(
+    "url", ["/", "/posts/{post.id}/", "/pages/about/", "/pages/rules/"]
+)
+def test_server_timing_header(user_client, post_with_published_location,
+                              url):
+    url = url.format(post=post_with_published_location)
+    with CaptureQueriesContext(connection) as queries:
+        response = user_client.get(url)
+    assert "Server-Timing" in response, (
+        f"Убедитесь, что страница `{url}` отдаёт заголовок Server-Timing."
+    )
+    metrics = parse_server_timing(response["Server-Timing"])
+    assert set(metrics) == {"db", "tpl", "cache", "total"}
+    for values in metrics.values():
+        assert re.fullmatch(r"\d+\.\d", values["dur"])
+    assert metrics["db"]["desc"] == f'"{len(queries)}"', (
+        "В Server-Timing должно быть число запросов к базе."
+    )
+    assert float(metrics["tpl"]["dur"]) > 0
+
+
+def test_cache_calls_are_counted(client, post_with_published_location):
+    client.get("/")
+    response = client.get("/")
+    assert response["X-Page-Cache"] == "HIT"
+    metrics = parse_server_timing(response["Server-Timing"])
+    assert int(metrics["cache"]["desc"].strip('"')) > 0, (
+        "В Server-Timing должно быть число обращений к кэшу."
+    )
+
+
+def test_server_timing_can_be_disabled(settings, client):
+    settings.SERVER_TIMING = False
+    assert "Server-Timing" not in client.get("/pages/about/")
+
+
+def test_async_chain_reports_timings(user, async_client,
+                                     post_with_published_location):
+    async def get_response(request):
+        return HttpResponse()
+
+    assert iscoroutinefunction(ServerTimingMiddleware(get_response)), (
+        "Убедитесь, что Server-Timing встаёт в async-цепочку "
+        "без обёртки sync_to_async."
+    )
+    async_client.force_login(user)
+    response = async_to_sync(async_client.get)("/async/")
+    metrics = parse_server_timing(response["Server-Timing"])
+    assert int(metrics["db"]["desc"].strip('"')) > 0, (
+        "Запросы async ORM должны попадать в фазу db."
+    )
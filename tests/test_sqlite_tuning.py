@@ -0,0 +1,34 @@
+from io import StringIO
+
+import pytest
+from django.conf import settings
+from django.core.management import call_command
+from django.db import connection
+
+pytestmark = [
+    pytest.mark.django_db,
+    pytest.mark.skipif(
+        connection.vendor != "sqlite", reason="Профиль только для SQLite"
+    ),
+]
+
+
+@pytest.mark.parametrize("pragma", ["busy_timeout", "cache_size"])
+def test_connection_gets_pragmas(pragma):
+    with connection.cursor() as cursor:
+        cursor.execute(f"PRAGMA {pragma}")
+        value = cursor.fetchone()[0]
+    assert value == settings.SQLITE_PRAGMAS[pragma], (
+        f"Убедитесь, что при подключении к SQLite выполняется"
+        f" PRAGMA {pragma} из настройки SQLITE_PRAGMAS."
+    )
+
+
+def test_benchmark_sqlite_compares_profiles():
+    out = StringIO()
+    call_command(
+        "benchmark_sqlite", threads=[2], duration=0.2, posts=10, stdout=out
+    )
+    rows = [line.split() for line in out.getvalue().splitlines()[1:]]
+    assert [row[:2] for row in rows] == [["default", "2"], ["tuned", "2"]]
+    assert all(float(row[2]) > 0 for row in rows)
@@ -0,0 +1,78 @@
+from io import BytesIO
+
+import pytest
+from django.core.files.images import ImageFile
+from django.core.management import call_command
+from mixer.backend.django import Mixer
+from PIL import Image
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def post_with_big_image(
+        mixer: Mixer, media_root, user, published_category):
+    img_io = BytesIO()
+    Image.new("RGB", (1000, 500), color=(73, 109, 137)).save(img_io, "JPEG")
+    return mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        image=ImageFile(img_io, name="big.jpg"),
+    )
+
+
+def thumbnails(media_root):
+    return sorted(
+        (path.name, Image.open(path).size)
+        for path in (media_root / "posts_thumbnails").glob("*.jpg")
+    )
+
+
+def test_thumbnails_generated_on_save(
+        user_client, media_root, post_with_big_image):
+    name = post_with_big_image.image.name.rsplit("/", 1)[-1]
+    assert thumbnails(media_root) == [
+        (f"{name}.320w.jpg", (320, 160)),
+        (f"{name}.640w.jpg", (640, 320)),
+    ], "Убедитесь, что при сохранении поста создаются миниатюры."
+
+    content = user_client.get("/").content.decode("utf-8")
+    assert f"{name}.320w.jpg 320w" in content
+    assert f'{post_with_big_image.image.url} 1000w"' in content, (
+        "Убедитесь, что оригинал изображения — самый широкий кандидат "
+        "в srcset."
+    )
+    assert f'src="/media/posts_thumbnails/{name}.640w.jpg"' in content
+    assert 'loading="lazy"' in content and "sizes=" in content
+
+
+def test_card_refreshed_after_thumbnails(
+        monkeypatch, client, mixer: Mixer, user, published_category):
+    from blog import signals
+
+    generate_thumbnails = signals.generate_thumbnails
+
+    def render_before_thumbnails(image):
+        client.get("/")
+        return generate_thumbnails(image)
+
+    monkeypatch.setattr(
+        signals, "generate_thumbnails", render_before_thumbnails
+    )
+    img_io = BytesIO()
+    Image.new("RGB", (1000, 500)).save(img_io, "JPEG")
+    post = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True, image=ImageFile(img_io, name="race.jpg"),
+    )
+    name = post.image.name.rsplit("/", 1)[-1]
+    assert f"{name}.320w.jpg 320w" in client.get("/").content.decode(), (
+        "Убедитесь, что карточка, закэшированная до создания миниатюр, "
+        "сбрасывается после их генерации."
+    )
+
+
+def test_backfill_command(media_root, post_with_big_image):
+    for path in (media_root / "posts_thumbnails").glob("*.jpg"):
+        path.unlink()
+    call_command("generate_thumbnails")
+    assert len(thumbnails(media_root)) == 2